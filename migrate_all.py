@@ -1,13 +1,30 @@
 """Main migration script for OpenWebUI migrator."""
 
+import logging
+import logging.handlers
 import sys
 from typing import NoReturn
 from utils.migrator import migrate_all
 from utils.exceptions import MigratorError, DatabaseError, DockerError
 
 
+def configure_logging() -> None:
+    """Send log records to stdout through a buffered handler.
+
+    Per-file notices are batched instead of writing to the terminal one by one;
+    warnings and errors flush the buffer immediately, so they print in order.
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    buffered_handler = logging.handlers.MemoryHandler(
+        capacity=500, flushLevel=logging.WARNING, target=stream_handler
+    )
+    logging.basicConfig(level=logging.INFO, handlers=[buffered_handler])
+
+
 def main() -> NoReturn:
     """Run the migration process."""
+    configure_logging()
     try:
         migrate_all()
         sys.exit(0)
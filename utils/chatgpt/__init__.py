@@ -2,9 +2,11 @@
 
 from .migrate_chatgpt_conversations import (
     parse_chatgpt,
+    iter_chatgpt,
     build_webui,
     convert_conversations_to_openwebui_format,
     convert_file,
+    iter_file,
 )
 from .migrate_chatgpt_memory import (
     parse_memory_file,
@@ -17,9 +19,11 @@ from .image_utils import get_ai_generated_images_to_copy, extract_images_from_me
 
 __all__ = [
     "parse_chatgpt",
+    "iter_chatgpt",
     "build_webui",
     "convert_conversations_to_openwebui_format",
     "convert_file",
+    "iter_file",
     "parse_memory_file",
     "parse_memory_text",
     "create_memory_sql",
@@ -0,0 +1,14 @@
+"""Identifier helpers shared by the ChatGPT conversation and memory migrations."""
+
+import os
+import uuid
+from typing import List
+
+
+def uuid4_batch(count: int) -> List[str]:
+    """Return ``count`` random UUID4 strings drawn from a single ``os.urandom`` call."""
+    raw = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+        for i in range(0, 16 * count, 16)
+    ]
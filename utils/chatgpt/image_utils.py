@@ -1,83 +1,76 @@
 """Utilities for handling image assets during ChatGPT to OpenWebUI migration."""
 
-import base64
+import functools
+import logging
 import os
 import re
-from typing import Optional, Dict, List, Tuple, Any
-import mimetypes
-
-
-def get_image_mime_type(filename: str) -> str:
-    """Get MIME type for an image file based on extension."""
-    mime_type, _ = mimetypes.guess_type(filename)
-    if mime_type and mime_type.startswith("image/"):
-        return mime_type
-
-    # Fallback for common image types
-    ext_to_mime = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-        ".webp": "image/webp",
-        ".svg": "image/svg+xml",
-        ".bmp": "image/bmp",
-        ".ico": "image/x-icon",
-        ".tiff": "image/tiff",
-        ".tif": "image/tiff",
-    }
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple, Any
 
-    ext = os.path.splitext(filename.lower())[1]
-    return ext_to_mime.get(ext, "image/jpeg")  # Default to JPEG
+logger = logging.getLogger(__name__)
 
+# Exported asset filenames start with their file ID, e.g. "file-XXXX-image.png"
+_FILE_ID_RE = re.compile(r"file-[A-Za-z0-9]+")
+_ASSET_POINTER_PREFIX = "file-service://file-"
 
-def encode_image_to_base64(image_path: str) -> Optional[str]:
-    """Encode an image file to base64 data URL format."""
-    try:
-        with open(image_path, "rb") as image_file:
-            image_data = image_file.read()
-            base64_encoded = base64.b64encode(image_data).decode("utf-8")
-            mime_type = get_image_mime_type(image_path)
-            return f"data:{mime_type};base64,{base64_encoded}"
-    except (OSError, IOError) as e:
-        print(f"Error: Failed to encode image {image_path}: {e}")
-        return None
+# Shared read-only default for missing message fields
+_EMPTY: Dict[str, Any] = {}
 
 
 def extract_file_id_from_asset_pointer(asset_pointer: str) -> Optional[str]:
     """Extract file ID from ChatGPT asset pointer URL."""
     # Format: "file-service://file-XXXXXX"
-    match = re.match(r"file-service://file-(.+)", asset_pointer)
-    if match:
-        return f"file-{match.group(1)}"
-    return None
+    if not asset_pointer.startswith(_ASSET_POINTER_PREFIX):
+        return None
+    file_suffix = asset_pointer[len(_ASSET_POINTER_PREFIX):]
+    return f"file-{file_suffix}" if file_suffix else None
 
 
-def find_image_file(file_id: str, data_dir: str) -> Optional[str]:
-    """Find the actual image file in the data directory based on file ID."""
-    # Check main data directory first
+def _index_directory(index: Dict[str, str], search_dir: str) -> None:
+    """Add files in ``search_dir`` to ``index`` keyed by their leading file ID."""
     try:
-        for filename in os.listdir(data_dir):
-            if filename.startswith(file_id):
-                full_path = os.path.join(data_dir, filename)
-                if os.path.isfile(full_path):
-                    return full_path
+        with os.scandir(search_dir) as entries:
+            for entry in entries:
+                match = _FILE_ID_RE.match(entry.name)
+                if match and entry.is_file():
+                    index.setdefault(match.group(0), entry.path)
     except (OSError, IOError) as e:
-        print(f"Error searching for file {file_id} in {data_dir}: {e}")
+        logger.error("Error scanning %s for image files: %s", search_dir, e)
+
 
-    # Check dalle-generations subdirectory
+@functools.lru_cache(maxsize=None)
+def _build_file_index(data_dir: str) -> Dict[str, str]:
+    """Map each exported file ID to its path in ``data_dir`` or its dalle-generations folder."""
+    index: Dict[str, str] = {}
+
+    # Check main data directory first
+    _index_directory(index, data_dir)
+
+    # Then the dalle-generations subdirectory
     dalle_dir = os.path.join(data_dir, "dalle-generations")
-    if os.path.exists(dalle_dir):
-        try:
-            for filename in os.listdir(dalle_dir):
-                if filename.startswith(file_id):
-                    full_path = os.path.join(dalle_dir, filename)
-                    if os.path.isfile(full_path):
-                        return full_path
-        except (OSError, IOError) as e:
-            print(f"Error searching for file {file_id} in {dalle_dir}: {e}")
+    if os.path.isdir(dalle_dir):
+        _index_directory(index, dalle_dir)
+
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _get_dalle_file_ids(dalle_dir: str) -> frozenset:
+    """Return the set of file IDs present in a dalle-generations folder."""
+    index: Dict[str, str] = {}
+    if os.path.isdir(dalle_dir):
+        _index_directory(index, dalle_dir)
+    return frozenset(index)
+
 
-    return None
+def clear_file_index_cache() -> None:
+    """Forget cached directory indexes so the next lookup rescans the disk."""
+    _build_file_index.cache_clear()
+    _get_dalle_file_ids.cache_clear()
+
+
+def find_image_file(file_id: str, data_dir: str) -> Optional[str]:
+    """Find the actual image file in the data directory based on file ID."""
+    return _build_file_index(data_dir).get(file_id)
 
 
 def is_ai_generated_image(
@@ -100,11 +93,8 @@ def is_ai_generated_image(
         return True
 
     # Check if file exists in dalle-generations folder
-    dalle_dir = "data/chatgpt/dalle-generations"
-    if os.path.exists(dalle_dir):
-        for filename in os.listdir(dalle_dir):
-            if filename.startswith(attachment_id):
-                return True
+    if attachment_id in _get_dalle_file_ids("data/chatgpt/dalle-generations"):
+        return True
 
     # Default to user-uploaded
     return False
@@ -114,37 +104,35 @@ def _process_image_attachment(
     attachment: Dict[str, Any],
     file_id: str,
     message_metadata: Dict[str, Any],
-    data_dir: str
+    data_dir: str,
 ) -> Tuple[Optional[Dict[str, Any]], str]:
-    """Process a single image attachment."""
+    """Process a single image attachment.
+
+    Images are stored as references into the uploads directory, with the
+    ``source_path`` the image is copied from. Images that cannot be read for
+    copying are skipped and counted as missing.
+    """
     # Find the actual file
     image_path = find_image_file(file_id, data_dir)
     if not image_path:
-        print(f"Warning: Image file not found for ID: {file_id}")
+        logger.warning("Image file not found for ID: %s", file_id)
+        return None, "missing"
+    if not os.access(image_path, os.R_OK):
+        logger.warning("Image file not readable, skipping: %s", image_path)
         return None, "missing"
 
+    basename = os.path.basename(image_path)
+    file_data = {
+        "type": "image",
+        "url": f"uploads/{basename}",
+        "name": attachment.get("name", basename),
+        "size": attachment.get("size", 0),
+    }
+
     # Determine if AI-generated
     if is_ai_generated_image(attachment, message_metadata, image_path):
-        # For AI-generated images, we'll store the path reference
-        file_data = {
-            "type": "image",
-            "url": f"uploads/{os.path.basename(image_path)}",
-            "name": attachment.get("name", os.path.basename(image_path)),
-            "size": attachment.get("size", 0),
-            "ai_generated": True,
-            "source_path": image_path,
-        }
-    else:
-        # For user-uploaded images, encode to base64
-        base64_url = encode_image_to_base64(image_path)
-        if not base64_url:
-            return None, "failed"
-        file_data = {
-            "type": "image",
-            "url": base64_url,
-            "name": attachment.get("name", os.path.basename(image_path)),
-            "size": attachment.get("size", 0),
-        }
+        file_data["ai_generated"] = True
+    file_data["source_path"] = image_path
 
     return file_data, "found"
 
@@ -173,23 +161,31 @@ def _process_non_image_attachment(attachment: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def process_all_attachments(
-    attachments: List[Dict[str, Any]],
-    parts: List[Any],
+def _process_image_jobs(
+    image_jobs: Dict[str, Dict[str, Any]],
     message_metadata: Dict[str, Any],
-    data_dir: str = "data/chatgpt",
-) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
-    """Process all attachments (images and non-images) and return OpenWebUI file format."""
-    files = []
-    stats = {"images_found": 0, "images_missing": 0, "non_images": 0}
+    data_dir: str,
+) -> Dict[str, Tuple[Optional[Dict[str, Any]], str]]:
+    """Process image attachments keyed by file ID."""
+    return {
+        file_id: _process_image_attachment(attachment, file_id, message_metadata, data_dir)
+        for file_id, attachment in image_jobs.items()
+    }
 
-    # Create a mapping of attachment IDs to attachment data
-    attachment_map = {att.get("id"): att for att in attachments if att.get("id")}
 
-    # Track which attachments have been processed via parts
-    processed_ids = set()
+def _collect_image_parts(
+    parts: List[Any],
+    attachment_map: Dict[str, Dict[str, Any]],
+    unprocessed: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Match image asset pointers in ``parts`` to their attachments.
+
+    Returns the unique attachments to process keyed by file ID, and the file ID
+    of every image part in order. Matched IDs are removed from ``unprocessed``.
+    """
+    image_jobs: Dict[str, Dict[str, Any]] = {}
+    image_refs: List[str] = []
 
-    # Process parts to find image asset pointers
     for part in parts:
         if isinstance(part, dict) and part.get("content_type") == "image_asset_pointer":
             asset_pointer = part.get("asset_pointer", "")
@@ -198,152 +194,172 @@ def process_all_attachments(
             if not file_id:
                 continue
 
-            processed_ids.add(file_id)
+            unprocessed.pop(file_id, None)
 
             # Find the corresponding attachment
             attachment = attachment_map.get(file_id)
             if not attachment:
-                print(f"Warning: No attachment found for file ID: {file_id}")
+                logger.warning("No attachment found for file ID: %s", file_id)
                 continue
 
-            # Process the image attachment
-            file_data, status = _process_image_attachment(
-                attachment, file_id, message_metadata, data_dir
-            )
-
-            if status == "missing":
-                stats["images_missing"] += 1
-            elif status == "found":
-                stats["images_found"] += 1
-                if file_data:
-                    files.append(file_data)
-
-    # Process remaining attachments that weren't found in parts (non-images)
-    for att_id, attachment in attachment_map.items():
-        if att_id not in processed_ids:
-            # This is a non-image attachment
-            file_data = _process_non_image_attachment(attachment)
-            files.append(file_data)
-            stats["non_images"] += 1
-
-            print(
-                f"Info: Non-image file detected: {file_data['name']} "
-                f"({file_data['mime_type']}) - content not available in export"
-            )
+            # Repeated asset pointers reuse the result of the first one
+            image_jobs.setdefault(file_id, attachment)
+            image_refs.append(file_id)
 
-    return files, stats
+    return image_jobs, image_refs
 
 
-def process_image_attachments(
+def process_all_attachments(
     attachments: List[Dict[str, Any]],
     parts: List[Any],
     message_metadata: Dict[str, Any],
     data_dir: str = "data/chatgpt",
-) -> List[Dict[str, Any]]:
-    """Process image attachments and return OpenWebUI file format.
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Process all attachments (images and non-images) and return OpenWebUI file format."""
+    files = []
+    stats = {"images_found": 0, "images_missing": 0, "non_images": 0}
 
-    This is a compatibility wrapper for the new process_all_attachments function.
-    """
-    files, _ = process_all_attachments(attachments, parts, message_metadata, data_dir)
-    # Filter to only return image files for backward compatibility
-    return [
-        f for f in files if f.get("type") == "image" or f.get("url", "").startswith("data:image")
-    ]
+    # Create a mapping of attachment IDs to attachment data
+    attachment_map = {att.get("id"): att for att in attachments if att.get("id")}
+
+    # Attachments not yet matched to an image part, in their original order
+    unprocessed = dict(attachment_map)
+    image_jobs, image_refs = _collect_image_parts(parts, attachment_map, unprocessed)
+
+    # Process the image attachments
+    results = _process_image_jobs(image_jobs, message_metadata, data_dir)
+    for file_id in image_refs:
+        file_data, status = results[file_id]
+        if status == "missing":
+            stats["images_missing"] += 1
+        elif status == "found":
+            stats["images_found"] += 1
+            if file_data:
+                files.append(file_data)
+
+    # Process remaining attachments that weren't found in parts (non-images)
+    for attachment in unprocessed.values():
+        # This is a non-image attachment
+        file_data = _process_non_image_attachment(attachment)
+        files.append(file_data)
+        stats["non_images"] += 1
+
+        logger.info(
+            "Non-image file detected: %s (%s) - content not available in export",
+            file_data["name"],
+            file_data["mime_type"],
+        )
+
+    return files, stats
 
 
 def extract_images_from_message(
-    message: Dict[str, Any], data_dir: str = "data/chatgpt"
+    message: Dict[str, Any],
+    data_dir: str = "data/chatgpt",
+    stats: Optional[Dict[str, int]] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
-    """Extract all images from a message and return files list and statistics."""
+    """Extract all images from a message and return files list and statistics.
+
+    When ``stats`` is given, counts are added to it instead of a new dictionary.
+    """
     files = []
-    stats = {"user_uploaded": 0, "ai_generated": 0, "failed": 0}
+    if stats is None:
+        stats = {"user_uploaded": 0, "ai_generated": 0, "failed": 0}
 
     # Get attachments and metadata
-    attachments = message.get("metadata", {}).get("attachments", [])
-    message_metadata = message.get("metadata", {})
+    message_metadata = message.get("metadata") or _EMPTY
+    attachments = message_metadata.get("attachments")
+    if not attachments:
+        return files, stats
 
     # Get message parts
-    content = message.get("content", {})
-    parts = content.get("parts", [])
+    parts = (message.get("content") or _EMPTY).get("parts", [])
+
+    processed_files, processing_stats = process_all_attachments(
+        attachments, parts, message_metadata, data_dir
+    )
 
-    if attachments:
-        processed_files = process_image_attachments(attachments, parts, message_metadata, data_dir)
+    for file_data in processed_files:
+        if "_migration_note" in file_data:  # Non-image file
+            continue
+        files.append(file_data)
+        if file_data.get("ai_generated"):
+            stats["ai_generated"] += 1
+        else:
+            stats["user_uploaded"] += 1
 
-        for file_data in processed_files:
-            files.append(file_data)
-            if file_data.get("ai_generated"):
-                stats["ai_generated"] += 1
-            else:
-                stats["user_uploaded"] += 1
+    # Add failed images to stats
+    stats["failed"] += processing_stats.get("images_missing", 0)
 
     return files, stats
 
 
 def extract_all_files_from_message(
-    message: Dict[str, Any], data_dir: str = "data/chatgpt"
+    message: Dict[str, Any],
+    data_dir: str = "data/chatgpt",
+    stats: Optional[Dict[str, int]] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
-    """Extract all files from a message and return files list and statistics."""
+    """Extract all files from a message and return files list and statistics.
+
+    When ``stats`` is given, counts are added to it instead of a new dictionary.
+    """
     files = []
-    stats = {"user_uploaded": 0, "ai_generated": 0, "non_images": 0, "failed": 0}
+    if stats is None:
+        stats = {"user_uploaded": 0, "ai_generated": 0, "non_images": 0, "failed": 0}
 
     # Get attachments and metadata
-    attachments = message.get("metadata", {}).get("attachments", [])
-    message_metadata = message.get("metadata", {})
+    message_metadata = message.get("metadata") or _EMPTY
+    attachments = message_metadata.get("attachments")
+    if not attachments:
+        return files, stats
 
     # Get message parts
-    content = message.get("content", {})
-    parts = content.get("parts", [])
+    parts = (message.get("content") or _EMPTY).get("parts", [])
 
-    if attachments:
-        processed_files, processing_stats = process_all_attachments(
-            attachments, parts, message_metadata, data_dir
-        )
+    processed_files, processing_stats = process_all_attachments(
+        attachments, parts, message_metadata, data_dir
+    )
 
-        for file_data in processed_files:
-            files.append(file_data)
-            # Count based on file type
-            if "_migration_note" in file_data:  # Non-image file
-                stats["non_images"] += 1
-            elif file_data.get("ai_generated"):
-                stats["ai_generated"] += 1
-            else:
-                stats["user_uploaded"] += 1
+    for file_data in processed_files:
+        files.append(file_data)
+        # Count based on file type
+        if "_migration_note" in file_data:  # Non-image file
+            stats["non_images"] += 1
+        elif file_data.get("ai_generated"):
+            stats["ai_generated"] += 1
+        else:
+            stats["user_uploaded"] += 1
 
-        # Add failed images to stats
-        stats["failed"] = processing_stats.get("images_missing", 0)
+    # Add failed images to stats
+    stats["failed"] += processing_stats.get("images_missing", 0)
 
     return files, stats
 
 
-def get_ai_generated_images_to_copy(
-    conversations: List[Dict[str, Any]],
-) -> List[Tuple[str, str]]:
-    """Get list of AI-generated images that need to be copied to Docker volume."""
-    images_to_copy = []
+def iter_ai_generated_images(
+    conversations: Iterable[Dict[str, Any]],
+) -> Iterator[Tuple[str, str]]:
+    """Yield ``(source_path, filename)`` for each image referenced by path, once.
 
-    for conv in conversations:
-        # Check the special metadata field first
-        if "_files_with_metadata" in conv:
-            for file_data in conv["_files_with_metadata"]:
-                if file_data.get("ai_generated") and "source_path" in file_data:
-                    source = file_data["source_path"]
-                    # Destination will be in the Docker volume's uploads directory
-                    dest_name = os.path.basename(source)
-                    images_to_copy.append((source, dest_name))
-
-        # Also check messages for files with metadata
-        if "messages" in conv:
-            for msg in conv["messages"]:
-                if "files" in msg:
-                    # This won't have metadata anymore, skip
-                    continue
-
-    # Remove duplicates while preserving order
+    Images are yielded as each conversation is reached, so a streamed
+    ``conversations`` is never held in memory as a whole.
+    """
     seen = set()
-    unique_images = []
-    for item in images_to_copy:
-        if item not in seen:
-            seen.add(item)
-            unique_images.append(item)
+    for conv in conversations:
+        for file_data in conv.get("files", ()):
+            source = file_data.get("source_path")
+            if source is not None and source not in seen:
+                seen.add(source)
+                # Destination will be in the Docker volume's uploads directory
+                yield source, os.path.basename(source)
 
-    return unique_images
+
+def get_ai_generated_images_to_copy(
+    conversations: Iterable[Dict[str, Any]],
+) -> List[Tuple[str, str]]:
+    """Get list of images referenced by path that need to be copied to Docker volume.
+
+    This covers AI-generated images as well as user uploads stored as file references.
+    ``conversations`` is consumed once, so it may be a generator.
+    """
+    return list(iter_ai_generated_images(conversations))
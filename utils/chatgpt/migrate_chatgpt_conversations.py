@@ -1,22 +1,63 @@
 #!/usr/bin/env python3
 """Convert ChatGPT exports to open-webui JSON format."""
 
+import functools
 import json
 import os
 import re
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Set, Tuple, Optional
 from dataclasses import dataclass
 import time
 import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import datetime
-from .image_utils import extract_all_files_from_message
+from .id_utils import uuid4_batch
+from .image_utils import clear_file_index_cache, extract_all_files_from_message
 
-INVALID_RE = re.compile(r"[\ue000-\uf8ff]")
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maps every BMP private-use code point (U+E000-U+F8FF) to None for str.translate
+PUA_TABLE = dict.fromkeys(range(0xE000, 0xF900))
+# Whitespace runs (group 1) become "_", any other disallowed characters are dropped
+SLUG_RE = re.compile(r"(\s+)|[^a-zA-Z0-9_\-\s]+")
+
+# Shared read-only default for missing nested dicts; never mutate it
+_EMPTY: Dict[str, Any] = {}
 
 # Default fallback model and name
 DEFAULT_MODEL = "openai-chatgpt-4o"
 DEFAULT_MODEL_NAME = "ChatGPT 4o"
 
+# Known ChatGPT model slugs and their open-webui (id, name)
+MODEL_MAP = {
+    "gpt-4": ("openai-gpt-4", "GPT-4"),
+    "gpt-4o": ("openai-gpt-4o", "GPT-4o"),
+    "gpt-4o-jawboned": ("openai-gpt-4o", "GPT-4o"),
+    "gpt-4o-canmore": ("openai-gpt-4o", "GPT-4o"),
+    "gpt-4o-mini": ("openai-gpt-4o-mini", "GPT-4o mini"),
+    "gpt-4-1": ("openai-gpt-4.1", "GPT-4.1"),
+    "gpt-4.1-mini": ("openai-gpt-4.1-mini", "GPT-4.1 mini"),
+    "gpt-4.1-nano": ("openai-gpt-4.1-nano", "GPT-4.1 nano"),
+    "gpt-4-5": ("openai-gpt-4.5-preview", "GPT-4.5 Preview"),
+    "gpt-3.5-turbo": ("openai-gpt-3.5", "GPT-3.5"),
+    "o1-preview": ("openai-o1-preview", "o1-preview"),
+    "o1-mini": ("openai-o1-mini", "o1-mini"),
+    "o3-mini": ("openai-o3-mini", "o3-mini"),
+    "o3-mini-high": ("openai-o3-mini-high", "o3-mini-high"),
+    "o3": ("openai-o3", "o3"),
+    "o4-mini": ("openai-o4-mini", "o4-mini"),
+    "o4-mini-high": ("openai-o4-mini-high", "o4-mini-high"),
+}
+
 
 @dataclass
 class MessageContext:
@@ -31,33 +72,17 @@ def sanitize_text(text: Any) -> str:
     """Return ``text`` without private-use Unicode characters."""
     if not isinstance(text, str):
         return ""
-    return INVALID_RE.sub("", text)
+    if text.isascii():
+        # Private-use code points are never ASCII, so there is nothing to strip
+        return text
+    return text.translate(PUA_TABLE)
 
 
+@functools.lru_cache(maxsize=256)
 def chatgpt_model_to_openwebui(model_slug: str) -> Tuple[str, str]:
     """Convert ChatGPT model slug to open-webui format."""
-    model_mapping = {
-        "gpt-4": ("openai-gpt-4", "GPT-4"),
-        "gpt-4o": ("openai-gpt-4o", "GPT-4o"),
-        "gpt-4o-jawboned": ("openai-gpt-4o", "GPT-4o"),
-        "gpt-4o-canmore": ("openai-gpt-4o", "GPT-4o"),
-        "gpt-4o-mini": ("openai-gpt-4o-mini", "GPT-4o mini"),
-        "gpt-4-1": ("openai-gpt-4.1", "GPT-4.1"),
-        "gpt-4.1-mini": ("openai-gpt-4.1-mini", "GPT-4.1 mini"),
-        "gpt-4.1-nano": ("openai-gpt-4.1-nano", "GPT-4.1 nano"),
-        "gpt-4-5": ("openai-gpt-4.5-preview", "GPT-4.5 Preview"),
-        "gpt-3.5-turbo": ("openai-gpt-3.5", "GPT-3.5"),
-        "o1-preview": ("openai-o1-preview", "o1-preview"),
-        "o1-mini": ("openai-o1-mini", "o1-mini"),
-        "o3-mini": ("openai-o3-mini", "o3-mini"),
-        "o3-mini-high": ("openai-o3-mini-high", "o3-mini-high"),
-        "o3": ("openai-o3", "o3"),
-        "o4-mini": ("openai-o4-mini", "o4-mini"),
-        "o4-mini-high": ("openai-o4-mini-high", "o4-mini-high"),
-    }
-
-    if model_slug in model_mapping:
-        return model_mapping[model_slug]
+    if model_slug in MODEL_MAP:
+        return MODEL_MAP[model_slug]
 
     # If not found, try to construct a reasonable default
     if model_slug.startswith("gpt-"):
@@ -71,7 +96,9 @@ def chatgpt_model_to_openwebui(model_slug: str) -> Tuple[str, str]:
 
 def _process_canvas_content(text_content: str) -> Optional[str]:
     """Process canvas content from JSON text."""
-    if not text_content:
+    # Canvas documents are JSON objects with a "content" key; anything without
+    # that key cannot be one, so skip parsing it
+    if not isinstance(text_content, str) or '"content"' not in text_content:
         return None
     try:
         data = json.loads(text_content)
@@ -102,9 +129,13 @@ def extract_last_sentence(text: Any) -> str:
     cleaned = text.strip()
     if not cleaned:
         return ""
-    matches = re.findall(r"[^.!?]*[.!?]", cleaned, flags=re.DOTALL)
-    if matches:
-        return matches[-1].strip()
+    # The last sentence runs from just after the previous terminator to the last one
+    end = max(cleaned.rfind("."), cleaned.rfind("!"), cleaned.rfind("?"))
+    if end >= 0:
+        start = max(
+            cleaned.rfind(".", 0, end), cleaned.rfind("!", 0, end), cleaned.rfind("?", 0, end)
+        )
+        return cleaned[start + 1:end + 1].strip()
     lines = [ln.strip() for ln in cleaned.splitlines() if ln.strip()]
     return lines[-1] if lines else cleaned
 
@@ -114,19 +145,21 @@ def _parts_to_text(parts: List[Any]) -> str:
     texts: List[str] = []
     for part in parts:
         if isinstance(part, str):
-            texts.append(sanitize_text(part))
+            val = part
         elif isinstance(part, dict):
             # Skip canvas content and image pointers here as they're handled separately
             if part.get("content_type") == "code" and part.get("language") == "json":
                 continue
             if part.get("content_type") == "image_asset_pointer":
                 continue
+            val = part.get("text")
+        else:
+            continue
 
-            if "text" in part:
-                val = part.get("text")
-                if isinstance(val, str):
-                    texts.append(sanitize_text(val))
-    return "".join(texts)
+        # Empty parts add nothing to the joined text
+        if val and isinstance(val, str):
+            texts.append(sanitize_text(val))
+    return "".join(texts) if texts else ""
 
 
 def parse_timestamp(value: Any, default: float) -> float:
@@ -151,8 +184,11 @@ def _format_canvas_content(canvas_content: str) -> str:
 
 def extract_canvas_content_from_message(msg: dict) -> Optional[str]:
     """Extract canvas content directly from message content."""
-    content = msg.get("content", {})
+    return _extract_canvas_from_content(msg.get("content") or _EMPTY)
+
 
+def _extract_canvas_from_content(content: Dict[str, Any]) -> Optional[str]:
+    """Extract canvas content from a message's ``content`` dict."""
     # Check if this message itself contains canvas content
     if content.get("content_type") == "code" and content.get("language") == "json":
         result = _process_canvas_content(content.get("text", ""))
@@ -165,30 +201,25 @@ def extract_canvas_content_from_message(msg: dict) -> Optional[str]:
             return _format_canvas_content(sanitize_text(canvas_content))
 
     # Also check parts array for canvas content
-    parts = content.get("parts", [])
-    return extract_canvas_from_parts(parts)
+    return extract_canvas_from_parts(content.get("parts") or ())
 
 
 def _init_statistics() -> Dict[str, int]:
-    """Initialize statistics dictionary."""
+    """Initialize statistics dictionary.
+
+    The asset counters use the same keys as ``extract_all_files_from_message`` so
+    message files can be counted into this dictionary directly.
+    """
     return {
         "total_conversations": 0,
         "conversations_with_assets": 0,
-        "total_assets": 0,
-        "total_user_uploads": 0,
-        "total_ai_generated": 0,
-        "total_non_images": 0,
+        "user_uploaded": 0,
+        "ai_generated": 0,
+        "non_images": 0,
+        "failed": 0,
     }
 
 
-def _update_asset_statistics(stats: Dict[str, int], file_stats: Dict[str, int]) -> None:
-    """Update asset statistics."""
-    stats["total_assets"] += len(file_stats.get("files", []))
-    stats["total_user_uploads"] += file_stats.get("user_uploaded", 0)
-    stats["total_ai_generated"] += file_stats.get("ai_generated", 0)
-    stats["total_non_images"] += file_stats.get("non_images", 0)
-
-
 def _process_simple_message_format(
     item: Dict[str, Any],
     context: MessageContext
@@ -203,11 +234,10 @@ def _process_simple_message_format(
     for idx, msg in enumerate(item["chat_messages"]):
         # Extract text and files
         text = _extract_message_text(msg)
-        files, file_stats = extract_all_files_from_message(msg)
+        files, _ = extract_all_files_from_message(msg, stats=context.stats)
 
         if files:
             conversation_has_assets = True
-            _update_asset_statistics(context.stats, {"files": files, **file_stats})
 
         if text:
             # Determine role and model
@@ -230,7 +260,8 @@ def _extract_message_text(msg: Dict[str, Any]) -> str:
     """Extract text from a message."""
     text = msg.get("text")
     if not text and isinstance(msg.get("content"), list):
-        text = _parts_to_text(msg["content"])
+        # Parts are sanitized one by one while they are joined
+        return _parts_to_text(msg["content"])
     return sanitize_text(text)
 
 
@@ -253,18 +284,20 @@ def _process_message_node(
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[Dict[str, Any]]]:
     """Process a single message node and return regular message, canvas message, and files."""
     # Extract all files from message
-    files, file_stats = extract_all_files_from_message(msg)
-    if files:
-        _update_asset_statistics(context.stats, {"files": files, **file_stats})
+    files, _ = extract_all_files_from_message(msg, stats=context.stats)
+
+    # Look up the nested dicts once and share them below
+    content = msg.get("content") or _EMPTY
+    metadata = msg.get("metadata") or _EMPTY
+    role = (msg.get("author") or _EMPTY).get("role", "assistant")
 
     # Build messages based on content type
-    role = msg.get("author", {}).get("role", "assistant")
     ts_val = parse_timestamp(
         msg.get("create_time") or msg.get("timestamp") or context.timestamp,
         context.timestamp
     )
     model, model_name = _get_message_model(
-        msg, role, context.default_model, context.default_model_name
+        metadata, role, context.default_model, context.default_model_name
     )
 
     # Build message info dict
@@ -276,24 +309,24 @@ def _process_message_node(
     }
 
     # Try to extract canvas content first
-    canvas_content = extract_canvas_content_from_message(msg)
+    canvas_content = _extract_canvas_from_content(content)
     canvas_msg = (
-        _build_message(role, canvas_content, message_info)
+        {"role": role, "content": canvas_content, **message_info}
         if canvas_content else None
     )
 
     # Process regular text parts
-    text = sanitize_text(_parts_to_text(msg.get("content", {}).get("parts", [])))
+    text = _parts_to_text(content.get("parts") or ())
     regular_msg = None
 
     if text and text.strip() and role in {"user", "assistant"} and not canvas_content:
-        regular_msg = _build_message(role, text, message_info)
+        regular_msg = {"role": role, "content": text, **message_info}
 
     return regular_msg, canvas_msg, files
 
 
 def _get_message_model(
-    msg: Dict[str, Any],
+    metadata: Dict[str, Any],
     role: str,
     default_model: str,
     default_model_name: str
@@ -302,28 +335,12 @@ def _get_message_model(
     if role == "user":
         return default_model, default_model_name
 
-    model_slug = msg.get("metadata", {}).get("model_slug")
+    model_slug = metadata.get("model_slug")
     if model_slug:
         return chatgpt_model_to_openwebui(model_slug)
     return (default_model, default_model_name)
 
 
-def _build_message(
-    role: str,
-    content: str,
-    message_info: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Build a message dictionary."""
-    return {
-        "role": role,
-        "content": content,
-        "timestamp": message_info["timestamp"],
-        "model": message_info["model"],
-        "model_name": message_info["model_name"],
-        "files": message_info["files"],
-    }
-
-
 def _process_mapping_format(
     mapping: Dict[str, Any],
     current_id: Optional[str],
@@ -336,28 +353,29 @@ def _process_mapping_format(
     if not current_id or not isinstance(mapping.get(current_id), dict):
         return messages, has_assets
 
-    # Start from current node and traverse backwards
+    # Start from current node and traverse backwards, prepending so the
+    # result is already in chronological order
     node = mapping[current_id]
-    stack: List[Dict[str, Any]] = []
+    stack: Deque[Dict[str, Any]] = deque()
 
     while isinstance(node, dict):
-        msg = node.get("message") or {}
+        msg = node.get("message") or _EMPTY
         regular_msg, canvas_msg, files = _process_message_node(msg, context)
 
         if files:
             has_assets = True
 
         if canvas_msg:
-            stack.append(canvas_msg)
+            stack.appendleft(canvas_msg)
         if regular_msg:
-            stack.append(regular_msg)
+            stack.appendleft(regular_msg)
 
         parent_id = node.get("parent")
         if not parent_id:
             break
         node = mapping.get(parent_id)
 
-    messages.extend(reversed(stack))
+    messages.extend(stack)
     return messages, has_assets
 
 
@@ -387,7 +405,7 @@ def _process_alternative_mapping(
         if not isinstance(node, dict):
             break
 
-        msg = node.get("message") or {}
+        msg = node.get("message") or _EMPTY
         regular_msg, canvas_msg, files = _process_message_node(msg, context)
 
         if files:
@@ -403,21 +421,28 @@ def _process_alternative_mapping(
     return messages, has_assets
 
 
-def parse_chatgpt(data: Any) -> List[dict]:
-    """Parse ChatGPT conversation data and extract structured information."""
-    conversations = data if isinstance(data, list) else [data]
-    result = []
-    stats = _init_statistics()
-    stats["total_conversations"] = len(conversations)
+def iter_chatgpt(items: Iterable[Any], stats: Dict[str, int]) -> Iterator[dict]:
+    """Yield structured conversations from an iterable of ChatGPT conversation items.
 
-    for item in conversations:
+    Counts are accumulated in ``stats``; log them once the iterator is exhausted.
+    """
+    clear_file_index_cache()
+
+    for item in items:
+        stats["total_conversations"] += 1
         if not isinstance(item, dict):
             continue
 
         processed_conv = _process_conversation_item(item, stats)
         if processed_conv:
-            result.append(processed_conv)
+            yield processed_conv
+
 
+def parse_chatgpt(data: Any) -> List[dict]:
+    """Parse ChatGPT conversation data and extract structured information."""
+    conversations = data if isinstance(data, list) else [data]
+    stats = _init_statistics()
+    result = list(iter_chatgpt(conversations, stats))
     _log_statistics(stats)
     return result
 
@@ -538,17 +563,17 @@ def _create_fallback_message(
 
 def _log_statistics(stats: Dict[str, int]) -> None:
     """Log parsing statistics."""
+    images = stats["user_uploaded"] + stats["ai_generated"]
     print(f"Parsed {stats['total_conversations']} conversations")
     print(f"Found {stats['conversations_with_assets']} conversations with assets")
     print(
-        f"Total assets: {stats['total_assets']} "
-        f"(Images: {stats['total_user_uploads'] + stats['total_ai_generated']}, "
-        f"Non-images: {stats['total_non_images']})"
+        f"Total assets: {images + stats['non_images']} "
+        f"(Images: {images}, Non-images: {stats['non_images']})"
     )
-    print(f"  - User-uploaded images: {stats['total_user_uploads']}")
-    print(f"  - AI-generated images: {stats['total_ai_generated']}")
-    print(f"  - Non-image files (PDFs, JSON, etc.): {stats['total_non_images']}")
-    if stats['total_non_images'] > 0:
+    print(f"  - User-uploaded images: {stats['user_uploaded']}")
+    print(f"  - AI-generated images: {stats['ai_generated']}")
+    print(f"  - Non-image files (PDFs, JSON, etc.): {stats['non_images']}")
+    if stats['non_images'] > 0:
         print("  Note: Non-image file content not available in ChatGPT export")
 
 
@@ -593,16 +618,16 @@ def _process_conversation_messages(messages: List[Dict[str, Any]]) -> Dict[str,
     """Process messages and collect metadata."""
     messages_map: Dict[str, Any] = {}
     messages_list: List[Dict[str, Any]] = []
-    models_used = set()
+    # Ordered set: models in the order they first appear in the conversation
+    models_used: Dict[str, None] = {}
     conversation_files_with_metadata = []
     prev_id: Optional[str] = None
 
-    for msg_data in messages:
-        msg_id = str(uuid.uuid4())
+    for msg_data, msg_id in zip(messages, uuid4_batch(len(messages))):
 
         # Build message object
         msg = _build_webui_message(msg_data, msg_id, prev_id)
-        models_used.add(msg_data["model"])
+        models_used[msg_data["model"]] = None
 
         # Process files
         message_files = msg_data.get("files", [])
@@ -684,7 +709,6 @@ def _build_webui_structure(
         "tags": [],
         "timestamp": int(conversation["timestamp"] * 1000),
         "files": clean_file_data(messages_data["files_with_metadata"]),
-        "_files_with_metadata": messages_data["files_with_metadata"],
     }
 
     if user_id:
@@ -693,42 +717,143 @@ def _build_webui_structure(
     return webui
 
 
+def _slug_replacement(match: re.Match) -> str:
+    """Return the replacement for a ``SLUG_RE`` match."""
+    return "_" if match.group(1) else ""
+
+
 def slugify(text: Any) -> str:
     """Create a URL-safe slug from text."""
     if not isinstance(text, str):
         text = str(text)
-    text = re.sub(r"\s+", "_", text.strip())
-    text = re.sub(r"[^a-zA-Z0-9_\-]", "", text)
+    text = SLUG_RE.sub(_slug_replacement, text.strip())
     return text[:50] or "chat"
 
 
-def convert_file(path: str, user_id: str = "user", outdir: str = "output/chatgpt") -> None:
-    """Convert ChatGPT export file to OpenWebUI format JSON files."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def convert_file(
+    path: str,
+    user_id: str = "user",
+    outdir: str = "output/chatgpt",
+    max_workers: Optional[int] = None,
+) -> None:
+    """Convert ChatGPT export file to OpenWebUI format JSON files.
 
-    conversations = parse_chatgpt(data)
+    Conversations are parsed one at a time in this process, so only a few are
+    held in memory when ijson is installed. Building and writing each output
+    file is spread over ``max_workers`` processes (default: one per CPU);
+    pass ``max_workers=1`` to do everything in-process.
+    """
     os.makedirs(outdir, exist_ok=True)
+    stats = _init_statistics()
+    conversations = iter_chatgpt(_iter_export_items(path), stats)
+    workers = max_workers or os.cpu_count() or 1
 
-    for conv in conversations:
-        out, conv_uuid = build_webui(conv, user_id)
-        conv_id = conv.get("conversation_id")
-        unique = conv_id if conv_id else conv_uuid
-        fname = f"{slugify(conv['title'])}_{unique}.json"
+    if workers == 1:
+        for conv in conversations:
+            _write_conversation(conv, user_id, outdir)
+    else:
+        _write_conversations_parallel(conversations, user_id, outdir, workers)
+
+    _log_statistics(stats)
 
-        with open(os.path.join(outdir, fname), "w", encoding="utf-8") as fh:
-            json.dump(out, fh, ensure_ascii=False, indent=2)
+
+def iter_file(path: str, user_id: str = "user") -> Iterator[Dict[str, Any]]:
+    """Yield the OpenWebUI conversations of a ChatGPT export file without writing them.
+
+    Statistics are logged once the iterator is exhausted.
+    """
+    stats = _init_statistics()
+    for conv in iter_chatgpt(_iter_export_items(path), stats):
+        webui_conv, _ = build_webui(conv, user_id)
+        yield webui_conv
+
+    _log_statistics(stats)
+
+
+def _write_conversation(conv: Dict[str, Any], user_id: str, outdir: str) -> None:
+    """Build the OpenWebUI JSON for one parsed conversation and write it to ``outdir``."""
+    out, conv_uuid = build_webui(conv, user_id)
+    conv_id = conv.get("conversation_id")
+    unique = conv_id if conv_id else conv_uuid
+    fname = f"{slugify(conv['title'])}_{unique}.json"
+
+    _write_json(out, os.path.join(outdir, fname))
+
+
+def _write_conversations_parallel(
+    conversations: Iterable[Dict[str, Any]], user_id: str, outdir: str, workers: int
+) -> None:
+    """Write conversations from a process pool, keeping a bounded number in flight.
+
+    Output file names are unique per conversation, so workers never write the
+    same file. Submission is throttled so a streamed export is not pulled into
+    memory all at once.
+    """
+    max_pending = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        for conv in conversations:
+            pending.add(executor.submit(_write_conversation, conv, user_id, outdir))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        for future in pending:
+            future.result()
+
+
+def _iter_export_items(path: str) -> Iterator[Any]:
+    """Yield the top-level conversation items of a ChatGPT export file.
+
+    A top-level array is streamed item by item with ijson when it is installed;
+    anything else is loaded whole.
+    """
+    if ijson is not None:
+        with open(path, "rb") as f:
+            if f.read(64).lstrip().startswith(b"["):
+                f.seek(0)
+                yield from ijson.items(f, "item", use_float=True)
+                return
+
+    data = _load_json(path)
+    yield from data if isinstance(data, list) else [data]
+
+
+def _load_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(data: Dict[str, Any], path: str) -> None:
+    """Write ``data`` as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson encodes straight to UTF-8 bytes, much faster than json.dump
+        with open(path, "wb") as fh:
+            fh.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=2)
 
 
 def convert_conversations_to_openwebui_format(
     chatgpt_data: Any, user_id: str = "user"
-) -> List[Dict[str, Any]]:
-    """Convert ChatGPT data to OpenWebUI format and return as list of conversations."""
-    conversations = parse_chatgpt(chatgpt_data)
-    result = []
+) -> Iterator[Dict[str, Any]]:
+    """Convert ChatGPT data to OpenWebUI format, yielding one conversation at a time.
+
+    Statistics are logged once the iterator is exhausted; wrap the call in
+    ``list()`` if all conversations are needed at once.
+    """
+    items = chatgpt_data if isinstance(chatgpt_data, list) else [chatgpt_data]
+    stats = _init_statistics()
 
-    for conv in conversations:
+    for conv in iter_chatgpt(items, stats):
         webui_conv, _ = build_webui(conv, user_id)
-        result.append(webui_conv)
+        yield webui_conv
 
-    return result
+    _log_statistics(stats)
@@ -1,9 +1,29 @@
 """Migrate memory entries for open-webui from memory.txt file."""
 
+import io
+import mmap
+import os
 import re
 import time
-import uuid
-from typing import List
+from typing import Iterable, Iterator, List
+
+from .id_utils import uuid4_batch
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Two consecutive line breaks in any newline style, i.e. a blank line
+MEMORY_SEPARATOR_RE = re.compile(rb"(?:\r\n|\r(?!\n)|\n){2}")
+
+# Memories this short or shorter (after cleanup) are skipped
+MIN_MEMORY_LENGTH = 10
+
+# Rows per multi-row INSERT, kept well under SQLite's compound select limit
+MEMORY_BATCH_SIZE = 500
+
+SQL_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Characters to escape inside single-quoted SQL string literals
+SQL_ESCAPE_TABLE = str.maketrans({"'": "''"})
 
 
 def sanitize_text(text: str) -> str:
@@ -11,36 +31,50 @@ def sanitize_text(text: str) -> str:
     if not isinstance(text, str):
         return ""
     # Remove extra whitespace and normalize
-    text = re.sub(r"\s+", " ", text.strip())
+    text = WHITESPACE_RE.sub(" ", text.strip())
     return text
 
 
 def parse_memory_file(file_path: str) -> List[str]:
-    """Parse memory.txt and extract individual memories separated by blank lines."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Split by double newlines (blank lines) to separate memories
-    memories = []
-    raw_memories = content.split("\n\n")
+    """Parse memory.txt and extract individual memories separated by blank lines.
 
-    for memory in raw_memories:
-        clean_memory = sanitize_text(memory)
-        if clean_memory and len(clean_memory.strip()) > 10:  # Filter out very short entries
-            memories.append(clean_memory)
-
-    return memories
+    The file is memory-mapped and scanned for blank-line separators, so only
+    one memory at a time is copied out and decoded.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _clean_memories(
+                chunk.decode("utf-8") for chunk in _iter_memory_chunks(mm)
+            )
+
+
+def _iter_memory_chunks(data: mmap.mmap) -> Iterator[bytes]:
+    """Yield the raw byte blocks of ``data`` that lie between blank lines."""
+    start = 0
+    for separator in MEMORY_SEPARATOR_RE.finditer(data):
+        # Raw length is an upper bound on the cleaned length, so short blocks
+        # can be dropped without copying them out of the map
+        if separator.start() - start > MIN_MEMORY_LENGTH:
+            yield data[start:separator.start()]
+        start = separator.end()
+    if len(data) - start > MIN_MEMORY_LENGTH:
+        yield data[start:]
 
 
 def parse_memory_text(content: str) -> List[str]:
     """Parse memory text content and extract individual memories."""
     # Split by double newlines (blank lines) to separate memories
-    memories = []
-    raw_memories = content.split("\n\n")
+    return _clean_memories(content.split("\n\n"))
+
 
+def _clean_memories(raw_memories: Iterable[str]) -> List[str]:
+    """Sanitize raw memory blocks and drop the empty or very short ones."""
+    memories = []
     for memory in raw_memories:
         clean_memory = sanitize_text(memory)
-        if clean_memory and len(clean_memory.strip()) > 10:  # Filter out very short entries
+        if len(clean_memory) > MIN_MEMORY_LENGTH:  # Filter out very short entries
             memories.append(clean_memory)
 
     return memories
@@ -59,54 +93,52 @@ def create_memory_sql(
     """
     current_time = int(time.time())
 
-    sql_statements = []
-    sql_statements.append("-- Memory entries for open-webui")
-    sql_statements.append("-- Generated at: " + time.strftime("%Y-%m-%d %H:%M:%S"))
-    sql_statements.append("")
+    out = io.StringIO()
+    out.write("-- Memory entries for open-webui\n")
+    out.write("-- Generated at: " + time.strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
 
     if remove_existing:
         # Clear existing memories for this user
-        sql_statements.append(f"-- Clear existing memories for user {user_id}")
-        sql_statements.append(f"DELETE FROM memory WHERE user_id = '{user_id}';")
-        sql_statements.append("")
-
-        # When removing existing, we can use simple INSERT statements
-        for i, memory_content in enumerate(memories, 1):
-            memory_id = str(uuid.uuid4())
-
-            # Escape single quotes for SQL
-            escaped_content = memory_content.replace("'", "''")
-            sql_statement = f"""-- Memory {i}
-INSERT INTO memory (id, user_id, content, created_at, updated_at)
-VALUES ('{memory_id}', '{user_id}', '{escaped_content}', {current_time}, {current_time});"""
-
-            sql_statements.append(sql_statement)
-            sql_statements.append("")
+        out.write(f"-- Clear existing memories for user {user_id}\n")
+        out.write(f"DELETE FROM memory WHERE user_id = '{user_id}';\n\n")
     else:
-        # When not removing existing, check for duplicates
-        sql_statements.append("-- Skipping duplicate memories based on content")
-        sql_statements.append("")
-
-        for i, memory_content in enumerate(memories, 1):
-            memory_id = str(uuid.uuid4())
-
-            # Escape single quotes for SQL
-            escaped_content = memory_content.replace("'", "''")
-
+        # One statement inserts the whole batch, so duplicates inside it must go first
+        memories = list(dict.fromkeys(memories))
+        out.write("-- Skipping duplicate memories based on content\n\n")
+
+    for batch_start in range(0, len(memories), MEMORY_BATCH_SIZE):
+        batch = memories[batch_start:batch_start + MEMORY_BATCH_SIZE]
+        # Escape single quotes for SQL
+        escaped_batch = [content.translate(SQL_ESCAPE_TABLE) for content in batch]
+        rows = ",\n".join(
+            f"('{memory_id}', '{user_id}', '{escaped}', {current_time}, {current_time})"
+            for escaped, memory_id in zip(escaped_batch, uuid4_batch(len(batch)))
+        )
+        out.write(
+            f"-- Memories {batch_start + 1}-{batch_start + len(batch)}\n"
+            "INSERT INTO memory (id, user_id, content, created_at, updated_at)\n"
+        )
+        if remove_existing:
+            out.write(f"VALUES\n{rows};\n\n")
+        else:
             # Use INSERT ... WHERE NOT EXISTS to avoid duplicates
-            sql_statement = f"""-- Memory {i}
-INSERT INTO memory (id, user_id, content, created_at, updated_at)
-SELECT '{memory_id}', '{user_id}', '{escaped_content}', {current_time}, {current_time}
-WHERE NOT EXISTS (
-    SELECT 1 FROM memory
-    WHERE user_id = '{user_id}'
-    AND content = '{escaped_content}'
-);"""
+            out.write(
+                "SELECT v.column1, v.column2, v.column3, v.column4, v.column5\n"
+                f"FROM (VALUES\n{rows}\n) AS v\n"
+                "WHERE NOT EXISTS (\n"
+                "    SELECT 1 FROM memory\n"
+                "    WHERE memory.user_id = v.column2\n"
+                "    AND memory.content = v.column3\n"
+                ");\n\n"
+            )
+
+    return out.getvalue()
 
-            sql_statements.append(sql_statement)
-            sql_statements.append("")
 
-    return "\n".join(sql_statements)
+def _write_sql_file(output_file: str, sql_content: str) -> None:
+    """Write SQL content as UTF-8 in one buffered binary write."""
+    with open(output_file, "wb", buffering=SQL_WRITE_BUFFER_SIZE) as f:
+        f.write(sql_content.encode("utf-8"))
 
 
 def create_memory_sql_file(
@@ -119,8 +151,7 @@ def create_memory_sql_file(
     sql_content = create_memory_sql(memories, user_id, remove_existing)
 
     # Write to file
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(sql_content)
+    _write_sql_file(output_file, sql_content)
 
     print(f"Created SQL file: {output_file}")
     print(f"Generated {len(memories)} memory entries for user {user_id}")
@@ -141,8 +172,7 @@ def convert_memory_file_to_sql(
     sql_content = create_memory_sql(memories, user_id, remove_existing)
 
     if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(sql_content)
+        _write_sql_file(output_file, sql_content)
         print(f"Created SQL file: {output_file}")
         print(f"Generated {len(memories)} memory entries for user {user_id}")
 
@@ -16,13 +16,16 @@ class Config:
     # Local paths
     LOCAL_DB_NAME: str = "webui.db"
     LOCAL_DB_BACKUP_NAME: str = "webui.db.backup"
-    CONVERSATIONS_SQL_NAME: str = "conversations.sql"
     MEMORY_SQL_NAME: str = "memory.sql"
 
     # Directory names
     DATA_DIR: str = "data"
     OUTPUT_DIR: str = "output"
 
+    # Subdirectory of a provider's output directory holding the file lists of
+    # conversations converted in memory; kept apart from converted conversations
+    REFERENCED_FILES_DIR: str = "referenced-files"
+
     # Provider configuration
     SUPPORTED_PROVIDERS: Dict[str, Dict[str, Any]] = {
         "chatgpt": {
@@ -38,6 +41,8 @@ class Config:
 
     # Environment variables
     USER_ID_ENV_VAR: str = "USER_ID"
+    # Set to keep one converted JSON file per conversation, e.g. for debugging
+    PERSIST_CONVERSATIONS_ENV_VAR: str = "PERSIST_CONVERSATIONS"
 
     @classmethod
     def get_provider_path(cls, provider: str) -> Path:
@@ -54,12 +59,16 @@ class Config:
         """Get user ID from environment variable."""
         return os.getenv(cls.USER_ID_ENV_VAR, "")
 
+    @classmethod
+    def get_env_persist_conversations(cls) -> bool:
+        """Get whether converted conversations should be written to JSON files."""
+        return os.getenv(cls.PERSIST_CONVERSATIONS_ENV_VAR, "").lower() in ("1", "true", "yes")
+
     @classmethod
     def get_artifacts_to_clean(cls) -> List[str]:
         """Get list of artifacts to clean after migration."""
         return [
             cls.OUTPUT_DIR,
             cls.LOCAL_DB_NAME,
-            cls.CONVERSATIONS_SQL_NAME,
             cls.MEMORY_SQL_NAME,
         ]
@@ -1,16 +1,112 @@
 """Generate SQL insert statements from open-webui chat JSON files."""
 
 import argparse
+import functools
+import itertools
 import json
 import os
 import re
+import shutil
+import sqlite3
+import sys
+import tempfile
 import uuid
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# (id, user_id, title, created_at, updated_at, chat, meta), in CHAT_INSERT_SQL order
+ChatRow = tuple[str, str, str, int, int, str, str]
+
+CHAT_DELETE_SQL = 'DELETE FROM "main"."chat" WHERE "id" = ?'
+CHAT_INSERT_SQL = (
+    'INSERT INTO "main"."chat" '
+    '("id","user_id","title","share_id","archived","created_at",'
+    '"updated_at","chat","pinned","meta","folder_id") '
+    "VALUES (?,?,?,NULL,0,?,?,?,0,?,NULL)"
+)
+# Read buffer for JSON files parsed by load_json_field
+JSON_READ_BUFFER_SIZE = 1 << 20
+
+# File types picked up from directories passed on the command line
+GATHER_EXTENSIONS = (".json", ".txt")
+
+# Timestamps above this are taken to be in milliseconds rather than seconds
+MS_TIMESTAMP_THRESHOLD = 10_000_000_000
+
+# Rows bound per executemany call when inserting straight into a database
+INSERT_BATCH_SIZE = 500
+
+# Errors that mean a file of unknown type is not JSON
+JSON_ERRORS = (json.JSONDecodeError, UnicodeDecodeError) + (
+    (ijson.JSONError,) if ijson is not None else ()
+)
+
+# Reused for every chat's meta column; compact like orjson's output
+META_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=(",", ":")).encode
+
+SLUG_INVALID_RE = re.compile(r"[^a-z0-9_-]+")
+SLUG_DASHES_RE = re.compile(r"-+")
+
+# Tags every user gets, as (id, name) pairs
+BASE_TAGS = (
+    ("imported-grok", "imported-grok"),
+    ("imported-chatgpt", "imported-chatgpt"),
+    ("imported-claude", "imported-claude"),
+)
+TAG_UPSERT_TEMPLATE = (
+    'INSERT INTO "main"."tag" ("id","name","user_id","meta") '
+    "VALUES ('%s','%s','%s','null') "
+    'ON CONFLICT("id","user_id") DO UPDATE SET "name"=excluded."name";'
+)
+TAG_UPSERT_SQL = (
+    'INSERT INTO "main"."tag" ("id","name","user_id","meta") '
+    "VALUES (?,?,?,'null') "
+    'ON CONFLICT("id","user_id") DO UPDATE SET "name"=excluded."name"'
+)
 
 
 def load_json(path: str) -> dict:
-    """Load and parse JSON file from given path."""
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load and parse JSON file from given path, using orjson when it is installed."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json_field(path: str, field: str) -> list:
+    """Return the list stored under ``field`` in a JSON object file ([] if absent).
+
+    The file is parsed whole with orjson when it is installed. Otherwise ijson
+    builds only that list and skips past everything else, falling back to the
+    json module without it.
+    """
+    with open(path, "rb", buffering=JSON_READ_BUFFER_SIZE) as f:
+        if orjson is not None:
+            return orjson.loads(f.read()).get(field, [])
+        if ijson is not None:
+            return list(ijson.items(f, f"{field}.item", use_float=True))
+        return json.load(f).get(field, [])
+
+
+def dump_json(value) -> str:
+    """Serialize ``value`` to a JSON string, using orjson when it is installed.
+
+    orjson writes compact UTF-8 rather than ASCII-escaped output; both are the
+    same JSON once stored, and the result is SQL-escaped by the caller either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=True)
 
 
 def load_text(path: str) -> str:
@@ -23,148 +119,209 @@ def escape_sql_string(value: str) -> str:
     """Escape single quotes in SQL strings."""
     if not isinstance(value, str):
         value = str(value)
+    # Most values have no quotes; skip the copy replace() would make
+    if "'" not in value:
+        return value
     return value.replace("'", "''")
 
 
 def build_meta(tags: list[str]) -> str:
     """Build metadata JSON string with tags."""
-    meta = json.dumps({"tags": tags}, ensure_ascii=True)
-    return escape_sql_string(meta)
+    if orjson is not None:
+        return orjson.dumps({"tags": tags}).decode("utf-8")
+    return META_ENCODER({"tags": tags})
 
 
+@functools.lru_cache(maxsize=1024)
 def slugify(value: str) -> str:
     """Return a slug suitable for use as an identifier."""
-    value = value.lower()
-    value = re.sub(r"[^a-z0-9_-]+", "-", value)
-    return re.sub(r"-+", "-", value).strip("-")
+    value = SLUG_INVALID_RE.sub("-", value.lower())
+    return SLUG_DASHES_RE.sub("-", value).strip("-")
+
+
+def tag_rows(user_id: str, meta_tags: list[str]) -> list[tuple[str, str, str]]:
+    """Return ``(id, name, user_id)`` rows for the tags that must exist for the user."""
+    unique = dict(BASE_TAGS)
+    for t in meta_tags:
+        unique[slugify(t)] = t
+
+    return [(tag_id, name, user_id) for tag_id, name in unique.items()]
 
 
 def tag_upserts(user_id: str, meta_tags: list[str]) -> list[str]:
     """Return SQL statements to ensure tags exist for the user."""
-    base_tags = [
-        ("imported-grok", "imported-grok"),
-        ("imported-chatgpt", "imported-chatgpt"),
-        ("imported-claude", "imported-claude"),
-    ]
-    for t in meta_tags:
-        slug = slugify(t)
-        base_tags.append((slug, t))
+    return [TAG_UPSERT_TEMPLATE % row for row in tag_rows(user_id, meta_tags)]
+
+
+def chat_row_to_sql(row: ChatRow) -> str:
+    """Render a chat row as DELETE + INSERT statements with inline escaped values."""
+    record_id, user_id, title, created_at, updated_at, chat_json, meta = row
+    return "".join(
+        [
+            'DELETE FROM "main"."chat" WHERE "id" = \'',
+            record_id,
+            "';\n"
+            'INSERT INTO "main"."chat" '
+            '("id","user_id","title","share_id","archived","created_at",'
+            '"updated_at","chat","pinned","meta","folder_id")\n'
+            "VALUES ('",
+            record_id,
+            "','",
+            user_id,
+            "','",
+            escape_sql_string(title),
+            "',NULL,0,",
+            str(created_at),
+            ",",
+            str(updated_at),
+            ",'",
+            escape_sql_string(chat_json),
+            "',0,'",
+            escape_sql_string(meta),
+            "',NULL);",
+        ]
+    )
 
-    unique: dict[str, str] = {}
-    for tag_id, name in base_tags:
-        unique[tag_id] = name
 
-    stmts = []
-    for tag_id, name in unique.items():
-        stmts.append(
-            'INSERT INTO "main"."tag" ("id","name","user_id","meta") '
-            f"VALUES ('{tag_id}','{name}','{user_id}','null') "
-            'ON CONFLICT("id","user_id") DO UPDATE SET "name"=excluded."name";'
-        )
-    return stmts
+def strip_source_paths(conversation: dict) -> None:
+    """Remove host ``source_path`` entries from a conversation's files, in place.
 
+    They only tell the migrator where to copy images from and must not be
+    stored in the database.
+    """
+    file_lists = [conversation.get("files") or ()]
+    file_lists.extend(message.get("files") or () for message in conversation.get("messages") or ())
+    history = conversation.get("history") or {}
+    file_lists.extend(
+        message.get("files") or () for message in (history.get("messages") or {}).values()
+    )
+    for files in file_lists:
+        for file_data in files:
+            file_data.pop("source_path", None)
 
-def conversation_to_sql(
+
+def conversation_to_row(
     conversation: dict, tags: list[str], default_user_id: str = "user"
-) -> tuple[str, str]:
-    """Convert a single OpenWebUI conversation to SQL format."""
+) -> ChatRow:
+    """Convert a single OpenWebUI conversation to a chat row."""
     # Extract user_id, falling back to default if not present
     user_id = conversation.get("userId", default_user_id)
 
-    # Convert conversation to JSON
-    chat_json = json.dumps(conversation, ensure_ascii=True)
-    chat_json = escape_sql_string(chat_json)
-
     # Extract metadata
-    title = escape_sql_string(conversation.get("title", "Untitled"))
+    title = conversation.get("title", "Untitled")
     record_id = conversation.get("id", str(uuid.uuid4()))
     timestamp = conversation.get("timestamp", 0)
 
     # Convert to seconds if it appears to be in milliseconds
-    if timestamp > 10000000000:
-        timestamp = timestamp // 1000
-
-    # Build metadata with tags
-    meta = build_meta(tags)
-
-    # Generate SQL
-    sql = (
-        f'DELETE FROM "main"."chat" WHERE "id" = \'{record_id}\';\n'
-        'INSERT INTO "main"."chat" '
-        '("id","user_id","title","share_id","archived","created_at",'
-        '"updated_at","chat","pinned","meta","folder_id")\n'
-        f"VALUES ('{record_id}','{user_id}','{title}',NULL,0,"
-        f"{timestamp},{timestamp},'{chat_json}',0,'{meta}',NULL);"
+    timestamp = timestamp // 1000 if timestamp > MS_TIMESTAMP_THRESHOLD else timestamp
+    strip_source_paths(conversation)
+
+    return (
+        record_id,
+        user_id,
+        title if isinstance(title, str) else str(title),
+        timestamp,
+        timestamp,
+        dump_json(conversation),
+        build_meta(tags),
     )
 
-    return sql, user_id
+
+def conversation_to_sql(
+    conversation: dict, tags: list[str], default_user_id: str = "user"
+) -> tuple[str, str]:
+    """Convert a single OpenWebUI conversation to SQL format."""
+    row = conversation_to_row(conversation, tags, default_user_id)
+    return chat_row_to_sql(row), row[1]
 
 
-def memory_to_sql(
+def memory_to_row(
     memory_text: str, tags: list[str], default_user_id: str = "user"
-) -> tuple[str, str]:
-    """Convert memory text to SQL format as a special chat."""
+) -> ChatRow:
+    """Convert memory text to a chat row for a special memory chat."""
+    # The chat row and the conversation it stores share one id
+    record_id = "memory-" + uuid.uuid4().hex
+
     # Create a fake conversation structure for memory
     memory_conversation = {
         "title": "Custom Instructions / Memory",
         "messages": [{"role": "system", "content": memory_text, "timestamp": 0}],
         "create_time": 0,
-        "id": "memory-" + str(uuid.uuid4()),
+        "id": record_id,
     }
 
-    chat_json = json.dumps(memory_conversation, ensure_ascii=True)
-    chat_json = escape_sql_string(chat_json)
+    return (
+        record_id,
+        default_user_id,
+        "Custom Instructions / Memory",
+        0,
+        0,
+        dump_json(memory_conversation),
+        build_meta(tags + ["memory", "custom-instructions"]),
+    )
 
-    title = escape_sql_string("Custom Instructions / Memory")
-    record_id = "memory-" + str(uuid.uuid4())
-    user_id = default_user_id
-    created_at = 0
 
-    meta = build_meta(tags + ["memory", "custom-instructions"])
+def memory_to_sql(
+    memory_text: str, tags: list[str], default_user_id: str = "user"
+) -> tuple[str, str]:
+    """Convert memory text to SQL format as a special chat."""
+    row = memory_to_row(memory_text, tags, default_user_id)
+    return chat_row_to_sql(row), row[1]
 
-    sql = (
-        f'DELETE FROM "main"."chat" WHERE "id" = \'{record_id}\';\n'
-        'INSERT INTO "main"."chat" '
-        '("id","user_id","title","share_id","archived","created_at",'
-        '"updated_at","chat","pinned","meta","folder_id")\n'
-        f"VALUES ('{record_id}','{user_id}','{title}',NULL,0,"
-        f"{created_at},{created_at},'{chat_json}',0,'{meta}',NULL);"
-    )
-    return sql, user_id
 
+def starts_with_array(path: str) -> bool:
+    """Return True if the JSON document in ``path`` has an array at the top level."""
+    with open(path, "rb") as f:
+        return f.read(64).lstrip().startswith(b"[")
 
-def json_to_sql(path: str, tags: list[str]) -> tuple[str, str]:
-    """Convert JSON file to SQL statements."""
-    data = load_json(path)
 
-    # Check if this is an array of conversations or a single conversation
-    if isinstance(data, list):
-        # Array of conversations (could be ChatGPT export or multiple OpenWebUI conversations)
-        if not data:
-            raise ValueError(f"No conversations found in {path}")
+def json_to_rows(path: str, tags: list[str]) -> Iterator[ChatRow]:
+    """Convert JSON file to chat rows, yielding them one conversation at a time.
 
-        all_sql = []
-        user_ids = set()
+    A top-level array is streamed item by item with ijson when it is installed,
+    so a large export is never held in memory whole.
+    """
+    if ijson is not None and starts_with_array(path):
+        with open(path, "rb") as f:
+            yield from array_to_rows(ijson.items(f, "item", use_float=True), path, tags)
+        return
 
-        for conversation in data:
-            if isinstance(conversation, dict):
-                sql, user_id = conversation_to_sql(conversation, tags)
-                all_sql.append(sql)
-                user_ids.add(user_id)
+    data = load_json(path)
 
-        combined_sql = "\n".join(all_sql)
-        # Return first user_id for tag creation
-        return combined_sql, list(user_ids)[0] if user_ids else "user"
+    # Check if this is an array of conversations or a single conversation
+    if isinstance(data, list):
+        yield from array_to_rows(data, path, tags)
+        return
 
     # Single conversation object (OpenWebUI format)
     if isinstance(data, dict):
-        return conversation_to_sql(data, tags)
+        yield conversation_to_row(data, tags)
+        return
 
     raise ValueError(f"Invalid JSON format in {path}")
 
 
-def file_to_sql(path: str, tags: list[str]) -> tuple[str, str]:
-    """Convert file to SQL statements, detecting format automatically."""
+def array_to_rows(items: Iterable[Any], path: str, tags: list[str]) -> Iterator[ChatRow]:
+    """Convert the items of a top-level JSON array to chat rows."""
+    # Array of conversations (could be ChatGPT export or multiple OpenWebUI conversations)
+    items = iter(items)
+    empty = object()
+    first = next(items, empty)
+    if first is empty:
+        raise ValueError(f"No conversations found in {path}")
+
+    conversations = (c for c in itertools.chain([first], items) if isinstance(c, dict))
+    yield from conversations_to_rows(conversations, tags)
+
+
+def conversations_to_rows(conversations: Iterable[dict], tags: list[str]) -> Iterator[ChatRow]:
+    """Convert conversations to chat rows lazily, one at a time."""
+    for conversation in conversations:
+        yield conversation_to_row(conversation, tags)
+
+
+def file_to_rows(path: str, tags: list[str]) -> Iterator[ChatRow]:
+    """Convert file to chat rows, detecting format automatically."""
     # Check file extension and content to determine format
     _, ext = os.path.splitext(path.lower())
 
@@ -173,22 +330,58 @@ def file_to_sql(path: str, tags: list[str]) -> tuple[str, str]:
         memory_text = load_text(path)
         if not memory_text:
             raise ValueError(f"Empty memory file: {path}")
-        return memory_to_sql(memory_text, tags)
+        yield memory_to_row(memory_text, tags)
+        return
 
     if ext == ".json":
         # Handle as JSON (conversations)
-        return json_to_sql(path, tags)
+        yield from json_to_rows(path, tags)
+        return
 
     # Try to detect by content
     try:
         # Try parsing as JSON first
-        return json_to_sql(path, tags)
-    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        rows = list(json_to_rows(path, tags))
+    except JSON_ERRORS as exc:
         # Fall back to text
         memory_text = load_text(path)
         if not memory_text:
             raise ValueError(f"Empty file: {path}") from exc
-        return memory_to_sql(memory_text, tags)
+        rows = [memory_to_row(memory_text, tags)]
+    yield from rows
+
+
+def rows_user_id(rows: list[ChatRow]) -> str:
+    """Return the user id to create tags for: the user of the first row."""
+    # Return first user_id for tag creation
+    return rows[0][1] if rows else "user"
+
+
+def json_to_sql(path: str, tags: list[str]) -> tuple[str, str]:
+    """Convert JSON file to SQL statements."""
+    rows = list(json_to_rows(path, tags))
+    return "\n".join(chat_row_to_sql(row) for row in rows), rows_user_id(rows)
+
+
+def file_to_sql(path: str, tags: list[str]) -> tuple[str, str]:
+    """Convert file to SQL statements, detecting format automatically."""
+    rows = list(file_to_rows(path, tags))
+    return "\n".join(chat_row_to_sql(row) for row in rows), rows_user_id(rows)
+
+
+def write_chat_inserts(out: TextIO, rows: Iterable[ChatRow]) -> str:
+    """Write SQL for each of ``rows`` as it is produced and return the tag user id."""
+    user_id = None
+    for row in rows:
+        if user_id is None:
+            user_id = row[1]
+        out.write(chat_row_to_sql(row))
+        out.write("\n")
+    if user_id is None:
+        # Keep the blank separator line an empty file has always produced
+        out.write("\n")
+        return "user"
+    return user_id
 
 
 def gather_files(paths: list[str]) -> list[str]:
@@ -196,14 +389,63 @@ def gather_files(paths: list[str]) -> list[str]:
     result = []
     for p in paths:
         if os.path.isdir(p):
-            for name in os.listdir(p):
-                if name.endswith(".json") or name.endswith(".txt"):
-                    result.append(os.path.join(p, name))
+            with os.scandir(p) as entries:
+                result.extend(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(GATHER_EXTENSIONS) and entry.is_file()
+                )
         else:
             result.append(p)
     return result
 
 
+class FileProcessingError(Exception):
+    """Raised when an input file cannot be converted to chat rows."""
+
+
+def generate_sql(
+    paths: list[str],
+    tags: list[str],
+    output: Optional[str] = None,
+    database: Optional[str] = None,
+) -> None:
+    """Convert the chat files under ``paths`` to SQL.
+
+    The statements are written to ``output`` (stdout if not given), or the chats
+    are inserted straight into the SQLite ``database``.
+    """
+    files = gather_files(paths)
+    if database:
+        insert_into_database(database, files, tags)
+        return
+
+    spool_sql(((fpath, file_to_rows(fpath, tags)) for fpath in files), tags, output)
+
+
+def spool_sql(
+    sources: Iterable[tuple[str, Iterable[ChatRow]]], tags: list[str], output: Optional[str]
+) -> None:
+    """Write the chat rows of each ``(name, rows)`` source as SQL, after their tag upserts."""
+    user_ids: set[str] = set()
+    # Chat inserts are spooled to a temporary file: the tag upserts that must
+    # precede them depend on the user ids of every source
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as inserts:
+        for name, rows in sources:
+            try:
+                uid = write_chat_inserts(inserts, rows)
+            except Exception as exc:
+                raise FileProcessingError(f"Failed to process {name}: {exc}") from exc
+            user_ids.add(uid)
+
+        inserts.seek(0)
+        if output:
+            with open(output, "w", encoding="utf-8") as f:
+                write_sql(f, user_ids, tags, inserts)
+        else:
+            write_sql(sys.stdout, user_ids, tags, inserts)
+
+
 def main() -> None:
     """Main entry point for SQL generation script."""
     parser = argparse.ArgumentParser(description="Create SQL inserts for open-webui chats")
@@ -211,32 +453,68 @@ def main() -> None:
     parser.add_argument(
         "--tags", default="imported", help="Comma-separated tags for the meta field"
     )
-    parser.add_argument("--output", help="Write SQL statements to this file")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", help="Write SQL statements to this file")
+    target.add_argument(
+        "--database",
+        help="Insert chats directly into this SQLite database instead of writing SQL",
+    )
     args = parser.parse_args()
 
     tags = [t.strip() for t in args.tags.split(",") if t.strip()] or ["imported"]
 
-    files = gather_files(args.files)
-    inserts = []
-    user_ids: set[str] = set()
-    for fpath in files:
-        try:
-            sql, uid = file_to_sql(fpath, tags)
-            inserts.append(sql)
-            user_ids.add(uid)
-        except Exception as exc:
-            raise SystemExit(f"Failed to process {fpath}: {exc}") from exc
+    try:
+        generate_sql(args.files, tags, output=args.output, database=args.database)
+    except FileProcessingError as exc:
+        raise SystemExit(str(exc)) from exc
+
 
-    prefix = []
+def write_sql(out: TextIO, user_ids: set[str], tags: list[str], inserts: TextIO) -> None:
+    """Write tag upserts for every user, then copy the spooled chat inserts."""
     for uid in sorted(user_ids):
-        prefix.extend(tag_upserts(uid, tags))
-
-    output = "\n".join(prefix + inserts)
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output + "\n")
-    else:
-        print(output)
+        for stmt in tag_upserts(uid, tags):
+            out.write(stmt)
+            out.write("\n")
+    shutil.copyfileobj(inserts, out)
+
+
+def insert_into_database(db_path: str, files: list[str], tags: list[str]) -> None:
+    """Insert chats from ``files`` and their tags into a SQLite database.
+
+    Rows are bound as parameters with ``executemany`` in a single transaction,
+    so chat bodies are never escaped or re-tokenized as SQL text.
+    """
+    user_ids: set[str] = set()
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            for fpath in files:
+                try:
+                    uid = insert_rows(conn, file_to_rows(fpath, tags))
+                except sqlite3.Error:
+                    raise
+                except Exception as exc:
+                    raise FileProcessingError(f"Failed to process {fpath}: {exc}") from exc
+                user_ids.add(uid or "user")
+
+            for uid in sorted(user_ids):
+                conn.executemany(TAG_UPSERT_SQL, tag_rows(uid, tags))
+    finally:
+        conn.close()
+
+
+def insert_rows(conn: sqlite3.Connection, rows: Iterable[ChatRow]) -> Optional[str]:
+    """Insert chat rows in batches and return the user id of the first, if any."""
+    user_id = None
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, INSERT_BATCH_SIZE)):
+        if user_id is None:
+            user_id = batch[0][1]
+        # A repeated id would fail the insert; the last one wins, as in the SQL text
+        batch = list({row[0]: row for row in batch}.values())
+        conn.executemany(CHAT_DELETE_SQL, [(row[0],) for row in batch])
+        conn.executemany(CHAT_INSERT_SQL, batch)
+    return user_id
 
 
 if __name__ == "__main__":
@@ -1,19 +1,58 @@
 """Database operations module for OpenWebUI migrator."""
 
+import atexit
 import sqlite3
-import shutil
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, TextIO, Tuple, Optional
 from utils.config import Config
+from utils.create_sql import ChatRow, TAG_UPSERT_SQL, insert_rows, tag_rows
+from utils.file_ops import FileManager
 from utils.exceptions import DatabaseError, UserNotFoundError, ValidationError
 
 
 class DatabaseManager:
     """Manages database operations for the migrator."""
 
+    # Applied once to the cached connection. The journal mode is left alone:
+    # WAL would persist in the file and leave changes in a -wal sidecar that is
+    # not copied back into the container.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",
+    )
+    # Applied for the duration of bulk_load(); the previous values are restored after
+    BULK_LOAD_PRAGMAS = {
+        "synchronous": "OFF",
+        "journal_mode": "MEMORY",
+        "temp_store": "MEMORY",
+        "cache_size": "-262144",
+    }
+    # Minimum seconds between progress lines while replaying statements
+    PROGRESS_INTERVAL = 1.0
+
     def __init__(self, db_path: str = Config.LOCAL_DB_NAME):
         """Initialize the database manager."""
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the connection to the database, opening it on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path)
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+            atexit.register(self.close)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the cached database connection, if one is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            atexit.unregister(self.close)
 
     def create_backup(self) -> None:
         """Create a backup of the database."""
@@ -21,7 +60,7 @@ class DatabaseManager:
             raise FileNotFoundError(f"Database file not found: {self.db_path}")
 
         backup_path = Path(Config.LOCAL_DB_BACKUP_NAME)
-        shutil.copy2(self.db_path, backup_path)
+        FileManager.copy_file(Path(self.db_path), backup_path)
 
     def get_users(self) -> List[Tuple[str, str, str]]:
         """Get all users from the database.
@@ -30,20 +69,18 @@ class DatabaseManager:
             List of tuples containing (user_id, name, email)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id, name, email FROM user ORDER BY created_at")
-                return cursor.fetchall()
+            cursor = self._get_conn().cursor()
+            cursor.execute("SELECT id, name, email FROM user ORDER BY created_at")
+            return cursor.fetchall()
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get users: {e}") from e
 
     def user_exists(self, user_id: str) -> bool:
         """Check if a user exists in the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM user WHERE id = ?", (user_id,))
-                return cursor.fetchone() is not None
+            cursor = self._get_conn().cursor()
+            cursor.execute("SELECT id FROM user WHERE id = ?", (user_id,))
+            return cursor.fetchone() is not None
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to check user existence: {e}") from e
 
@@ -53,73 +90,132 @@ class DatabaseManager:
         Returns:
             Tuple containing (user_id, name, email) or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, email FROM user WHERE id = ?", (user_id,))
-            return cursor.fetchone()
+        cursor = self._get_conn().cursor()
+        cursor.execute("SELECT id, name, email FROM user WHERE id = ?", (user_id,))
+        return cursor.fetchone()
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Relax durability settings while migrations are applied.
+
+        Syncing is switched off and the rollback journal is kept in memory, so a
+        crash mid-load can leave the file corrupt; the migrator works on a copy
+        it has backed up first.
+        """
+        conn = self._get_conn()
+        previous = {
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in self.BULK_LOAD_PRAGMAS
+        }
+        for name, value in self.BULK_LOAD_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                conn.execute(f"PRAGMA {name}={value}")
+
+    def execute_rows(self, rows: Iterable[ChatRow], tags: List[str]) -> None:
+        """Insert chat rows, and the tags of their user, in a single transaction.
+
+        Rows are bound as parameters with ``executemany``, so chat bodies are
+        never escaped or re-tokenized as SQL text.
+        """
+        conn = self._get_conn()
+        changes_before = conn.total_changes
+        try:
+            with conn:
+                user_id = insert_rows(conn, rows)
+                if user_id is not None:
+                    conn.executemany(TAG_UPSERT_SQL, tag_rows(user_id, tags))
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to insert chats: {e}") from e
+
+        print(f"Successfully inserted chats ({conn.total_changes - changes_before} rows changed)")
 
     def execute_sql_file(self, sql_file_path: str) -> None:
         """Execute SQL statements from a file."""
         if not Path(sql_file_path).exists():
             raise FileNotFoundError(f"SQL file not found: {sql_file_path}")
 
-        with open(sql_file_path, "r", encoding="utf-8") as f:
-            sql_content = f.read()
-
         try:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                self._execute_statements(conn, sql_content, sql_file_path)
-            finally:
-                conn.close()
+            with open(sql_file_path, "r", encoding="utf-8") as f:
+                self._execute_statements_stream(self._get_conn(), f, sql_file_path)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to execute SQL file: {e}") from e
 
-    def _execute_statements(
-        self, conn: sqlite3.Connection, sql_content: str, sql_file_path: str
+    def _execute_statements_stream(
+        self, conn: sqlite3.Connection, file_obj: TextIO, sql_file_path: str
     ) -> None:
-        """Execute SQL statements from content."""
-        statements = sql_content.split(";\n")
-        total_statements = len([s for s in statements if s.strip()])
-        executed = 0
-
-        for statement in statements:
-            statement = statement.strip()
-            if not statement:
-                continue
+        """Execute the SQL statements read from ``file_obj`` in a single transaction.
 
-            try:
-                conn.execute(statement + ";")
+        Statements are read from the file one at a time, so the script is never
+        held in memory whole; ``executescript`` would need all of it and commits
+        any open transaction first. If a statement fails, the transaction is
+        rolled back and the statement is reported.
+        """
+        changes_before = conn.total_changes
+        executed = 0
+        last_progress = time.monotonic()
+
+        conn.execute("BEGIN")
+        with conn:
+            for statement in self._iter_statements(file_obj):
+                try:
+                    conn.execute(statement)
+                except sqlite3.Error as e:
+                    print(f"Error executing statement {executed + 1}: {e}")
+                    print(f"Statement preview: {statement[:100]}...")
+                    raise
                 executed += 1
-                if executed % 100 == 0:
-                    print(f"Executed {executed}/{total_statements} statements...")
-                    conn.commit()
-            except sqlite3.Error as e:
-                print(f"Error executing statement {executed + 1}: {e}")
-                print(f"Statement preview: {statement[:100]}...")
-                raise
-
-        conn.commit()
-        print(f"Successfully executed {executed} SQL statements from {sql_file_path}")
+                now = time.monotonic()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    print(f"Executed {executed} statements...")
+                    last_progress = now
+
+        print(
+            f"Successfully executed {executed} SQL statements from {sql_file_path} "
+            f"({conn.total_changes - changes_before} rows changed)"
+        )
+
+    @staticmethod
+    def _iter_statements(file_obj: TextIO) -> Iterator[str]:
+        """Yield the non-empty statements of ``file_obj``.
+
+        Lines are accumulated until one ending in ``";\\n"`` completes a
+        statement (a semicolon inside a quoted value does not), so only the
+        current statement is held in memory.
+        """
+        lines: List[str] = []
+        for line in file_obj:
+            lines.append(line)
+            if line.endswith(";\n"):
+                statement = "".join(lines)
+                if not sqlite3.complete_statement(statement):
+                    continue
+                lines.clear()
+                statement = statement.strip()
+                if statement:
+                    yield statement
+
+        statement = "".join(lines).strip()
+        if statement:
+            yield statement
 
     def validate_database(self) -> bool:
         """Validate that the database has the expected schema."""
         required_tables = ["user", "chat", "tag", "memory"]
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                existing_tables = {row[0] for row in cursor.fetchall()}
+            cursor = self._get_conn().cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing_tables = {row[0] for row in cursor.fetchall()}
 
-                missing_tables = [
-                    table for table in required_tables if table not in existing_tables
-                ]
+            missing_tables = [table for table in required_tables if table not in existing_tables]
 
-                if missing_tables:
-                    raise ValidationError(f"Missing required tables: {', '.join(missing_tables)}")
+            if missing_tables:
+                raise ValidationError(f"Missing required tables: {', '.join(missing_tables)}")
 
-                return True
+            return True
 
         except sqlite3.Error as e:
             raise DatabaseError(f"Database validation failed: {e}") from e
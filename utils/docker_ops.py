@@ -1,6 +1,10 @@
 """Docker operations module for OpenWebUI migrator."""
 
+import posixpath
 import subprocess
+import tarfile
+import threading
+from collections import deque
 from pathlib import Path
 from typing import List, Tuple, Dict, Any
 from utils.config import Config
@@ -10,6 +14,9 @@ from utils.exceptions import DockerError
 class DockerManager:
     """Manages Docker container operations."""
 
+    # Trailing stderr lines kept from a streaming `docker cp` for error messages
+    STDERR_TAIL_LINES: int = 50
+
     def __init__(self, container_name: str = Config.CONTAINER_NAME):
         """Initialize the Docker manager."""
         self.container_name = container_name
@@ -18,7 +25,11 @@ class DockerManager:
         """Stop the Docker container."""
         print(f"Stopping {self.container_name} container...")
         result = subprocess.run(
-            ["docker", "stop", self.container_name], capture_output=True, text=True, check=False
+            ["docker", "stop", self.container_name],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
         )
         if result.returncode != 0 and "No such container" not in result.stderr:
             raise DockerError(f"Failed to stop container: {result.stderr}")
@@ -27,7 +38,11 @@ class DockerManager:
         """Start the Docker container."""
         print(f"Starting {self.container_name} container...")
         result = subprocess.run(
-            ["docker", "start", self.container_name], capture_output=True, text=True, check=False
+            ["docker", "start", self.container_name],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
         )
         if result.returncode != 0:
             raise DockerError(f"Failed to start container: {result.stderr}")
@@ -37,7 +52,8 @@ class DockerManager:
         print(f"Copying {container_path} from container to {local_path}...")
         result = subprocess.run(
             ["docker", "cp", f"{self.container_name}:{container_path}", local_path],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             check=False,
         )
@@ -48,13 +64,51 @@ class DockerManager:
         """Copy a file from local filesystem to the Docker container."""
         result = subprocess.run(
             ["docker", "cp", local_path, f"{self.container_name}:{container_path}"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             check=False,
         )
         if result.returncode != 0:
             raise DockerError(f"Failed to copy to container: {result.stderr}")
 
+    def copy_files_to_container(self, files: List[Tuple[str, str]], container_dir: str) -> None:
+        """Copy several files into a container directory with one `docker cp`.
+
+        The files are streamed to `docker cp -` as a tar archive instead of
+        starting one Docker CLI process per file.
+
+        Args:
+            files: List of tuples (local_path, path relative to container_dir);
+                missing subdirectories are created
+            container_dir: Existing directory in the container
+        """
+        with subprocess.Popen(
+            ["docker", "cp", "-", f"{self.container_name}:{container_dir}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        ) as proc:
+            # Drain stderr while the archive is written so a chatty docker cannot
+            # fill the pipe and stall; only the tail is kept for the error message
+            stderr_tail: deque = deque(maxlen=self.STDERR_TAIL_LINES)
+            reader = threading.Thread(target=stderr_tail.extend, args=(proc.stderr,))
+            reader.start()
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                    for local_path, name in files:
+                        tar.add(local_path, arcname=name)
+                proc.stdin.close()
+            except OSError as e:
+                # docker exited early (broken pipe) or a local file vanished
+                proc.kill()
+                raise DockerError(f"Failed to stream files to container: {e}") from e
+            finally:
+                reader.join()
+            if proc.wait() != 0:
+                stderr = b"".join(stderr_tail).decode("utf-8", "replace")
+                raise DockerError(f"Failed to copy to container: {stderr}")
+
     def exec_command(self, command: List[str], check: bool = True) -> subprocess.CompletedProcess:
         """Execute a command in the Docker container."""
         full_command = ["docker", "exec", self.container_name] + command
@@ -114,7 +168,7 @@ class ImageSync:
         self.docker = docker_manager
 
     def sync_images(self, images_to_copy: List[Tuple[str, str]]) -> Tuple[int, int]:
-        """Sync AI-generated images to Docker container.
+        """Sync referenced images to Docker container.
 
         Args:
             images_to_copy: List of tuples (source_path, destination_name)
@@ -123,22 +177,50 @@ class ImageSync:
             Tuple of (successful_copies, failed_copies)
         """
         if not images_to_copy:
-            print("No AI-generated images to copy.")
+            print("No images to copy.")
             return 0, 0
 
-        print(f"Found {len(images_to_copy)} AI-generated images to copy.")
-
-        self.docker.create_directory(Config.CONTAINER_UPLOADS_PATH)
+        print(f"Found {len(images_to_copy)} images to copy.")
 
-        successful = 0
+        existing = []
         failed = 0
-
         for source_path, dest_name in images_to_copy:
-            if not Path(source_path).exists():
+            if Path(source_path).exists():
+                existing.append((source_path, dest_name))
+            else:
                 print(f"Source file not found: {source_path}")
                 failed += 1
-                continue
 
+        successful = 0
+        if existing:
+            # Stream into the parent directory with the uploads directory as the
+            # archive prefix, so docker cp creates it without a separate mkdir exec
+            uploads_parent, uploads_name = posixpath.split(Config.CONTAINER_UPLOADS_PATH)
+            archive_files = [
+                (source_path, posixpath.join(uploads_name, dest_name))
+                for source_path, dest_name in existing
+            ]
+            try:
+                self.docker.copy_files_to_container(archive_files, uploads_parent)
+                successful = len(existing)
+            except DockerError as e:
+                print(f"Bulk image copy failed ({e}), copying images one by one...")
+                self.docker.create_directory(Config.CONTAINER_UPLOADS_PATH)
+                successful, copy_failed = self._sync_images_one_by_one(existing)
+                failed += copy_failed
+
+        print(f"Successfully copied {successful} images.")
+        if failed > 0:
+            print(f"Failed to copy {failed} images.")
+
+        return successful, failed
+
+    def _sync_images_one_by_one(self, images_to_copy: List[Tuple[str, str]]) -> Tuple[int, int]:
+        """Copy images with one `docker cp` each, returning (successful, failed)."""
+        successful = 0
+        failed = 0
+
+        for source_path, dest_name in images_to_copy:
             try:
                 dest_path = f"{Config.CONTAINER_UPLOADS_PATH}/{dest_name}"
                 self.docker.copy_to_container(source_path, dest_path)
@@ -147,10 +229,6 @@ class ImageSync:
                 print(f"Failed to copy {source_path}: {e}")
                 failed += 1
 
-        print(f"Successfully copied {successful} AI-generated images.")
-        if failed > 0:
-            print(f"Failed to copy {failed} images.")
-
         return successful, failed
 
     def get_sync_status(self) -> Dict[str, Any]:
@@ -1,10 +1,17 @@
 """File operations module for OpenWebUI migrator."""
 
+import errno
 import json
+import os
 import shutil
 from pathlib import Path
 from typing import Any, Dict, List
 
+# Errors meaning copy_file_range cannot be used for this pair of files
+COPY_FILE_RANGE_UNSUPPORTED = frozenset(
+    {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EBADF}
+)
+
 
 class FileManager:
     """Manages file operations with proper error handling."""
@@ -92,7 +99,38 @@ class FileManager:
             raise FileNotFoundError(f"Source file not found: {source}")
 
         destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, destination)
+        if FileManager._copy_file_range(source, destination):
+            shutil.copystat(source, destination)
+        else:
+            shutil.copy2(source, destination)
+
+    @staticmethod
+    def _copy_file_range(source: Path, destination: Path) -> bool:
+        """Copy file contents in the kernel with ``os.copy_file_range``.
+
+        Args:
+            source: Source file path
+            destination: Destination file path
+
+        Returns:
+            False if the platform or filesystem does not support it
+        """
+        if not hasattr(os, "copy_file_range"):
+            return False
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError as e:
+                if e.errno in COPY_FILE_RANGE_UNSUPPORTED:
+                    return False
+                raise
+        return True
 
     @staticmethod
     def remove_path(path: Path) -> None:
@@ -1,10 +1,12 @@
 """Migration utilities for OpenWebUI migrator."""
 
+import logging
+import os
 import sys
-import json
 import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from dotenv import load_dotenv
 
 from utils.config import Config
@@ -19,73 +21,126 @@ from utils.exceptions import (
     MigratorError,
 )
 from utils.chatgpt import get_ai_generated_images_to_copy
+from utils.create_sql import load_json_field
 
 load_dotenv()
 
+@dataclass
+class MigrationContext:
+    """Managers shared by the steps of one provider migration.
 
-def get_user_id_from_database() -> str:
+    Each step helper builds a fresh context when none is passed, so they can
+    still be called on their own.
+    """
+
+    provider: str = "chatgpt"
+    docker_manager: DockerManager = field(default_factory=DockerManager)
+    db_manager: DatabaseManager = field(default_factory=DatabaseManager)
+    user_id: Optional[str] = None
+
+
+def flush_log_handlers() -> None:
+    """Write out log records held by buffering handlers, such as migrate_all.py's."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def get_user_id_from_database(context: Optional[MigrationContext] = None) -> str:
     """Get user ID from environment or database, with validation."""
-    db_manager = DatabaseManager()
-    user_selector = UserSelector(db_manager)
+    context = context or MigrationContext()
+    user_selector = UserSelector(context.db_manager)
     return user_selector.get_user_id()
 
 
-def stop_open_webui() -> None:
+def stop_open_webui(context: Optional[MigrationContext] = None) -> None:
     """Stop the open-webui Docker container."""
-    docker_manager = DockerManager()
-    docker_manager.stop_container()
+    context = context or MigrationContext()
+    context.docker_manager.stop_container()
 
 
-def copy_existing_database_from_docker() -> None:
+def copy_existing_database_from_docker(context: Optional[MigrationContext] = None) -> None:
     """Copy the existing database from the Docker container."""
-    docker_manager = DockerManager()
-    db_sync = DatabaseSync(docker_manager)
+    context = context or MigrationContext()
+    db_sync = DatabaseSync(context.docker_manager)
     db_sync.pull_database()
 
 
-def create_backup_database_from_existing_database() -> None:
+def create_backup_database_from_existing_database(
+    context: Optional[MigrationContext] = None,
+) -> None:
     """Create a backup of the existing database."""
     print("Creating backup of existing database...")
-    db_manager = DatabaseManager()
-    db_manager.create_backup()
+    context = context or MigrationContext()
+    context.db_manager.create_backup()
 
 
-def copy_ai_generated_images_to_docker(provider: str = "chatgpt") -> None:
-    """Copy AI-generated images to the Docker volume's uploads directory."""
+def copy_ai_generated_images_to_docker(
+    provider: str = "chatgpt", context: Optional[MigrationContext] = None
+) -> None:
+    """Copy AI-generated and referenced uploaded images to the Docker volume's uploads directory."""
+    context = context or MigrationContext(provider)
     output_path = Config.get_output_path(provider)
 
     if not output_path.exists():
         print(f"No output directory found for {provider}, skipping image copy.")
         return
 
-    conversations = []
-    for json_file in output_path.glob("*.json"):
-        with open(json_file, "r", encoding="utf-8") as f:
-            conversations.append(json.load(f))
-
-    images_to_copy = get_ai_generated_images_to_copy(conversations)
+    images_to_copy = get_ai_generated_images_to_copy(iter_output_conversations(output_path))
 
-    docker_manager = DockerManager()
-    image_sync = ImageSync(docker_manager)
+    image_sync = ImageSync(context.docker_manager)
     image_sync.sync_images(images_to_copy)
 
 
-def convert_conversation_to_sql(provider: str = "chatgpt", user_id: Optional[str] = None) -> str:
+def read_conversation_files(json_file: str) -> Dict[str, Any]:
+    """Return ``{"files": [...]}`` with the path-referenced files of one converted conversation."""
+    files = load_json_field(json_file, "files")
+    # Only entries with a source path are copied; drop the rest before they are pickled
+    return {"files": [file_data for file_data in files if "source_path" in file_data]}
+
+
+def iter_output_conversations(output_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the file lists of the converted conversations in a provider's output directory.
+
+    Both converted conversation files and the file lists saved for conversations
+    converted in memory are read, one file at a time in directory order.
+    """
+    for directory in (output_path, output_path / Config.REFERENCED_FILES_DIR):
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as entries:
+            json_files = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(Config.JSON_EXTENSION)
+                and entry.is_file(follow_symlinks=False)
+            ]
+        yield from map(read_conversation_files, json_files)
+
+
+def convert_conversation_to_sql(
+    provider: str = "chatgpt",
+    user_id: Optional[str] = None,
+    context: Optional[MigrationContext] = None,
+) -> str:
     """Convert conversation data to SQL format using provider-specific utilities."""
     print(f"Converting {provider} conversations to SQL...")
 
+    context = context or MigrationContext(provider)
     migration_provider = ProviderFactory.create(provider)
 
+    user_id = user_id or context.user_id
     if not user_id:
         print("Getting user ID from database...")
-        user_id = get_user_id_from_database()
+        user_id = get_user_id_from_database(context)
+    context.user_id = user_id
 
     try:
         migration_provider.convert_conversations(user_id)
-        migration_provider.generate_sql_from_json()
     except (ProviderError, FileOperationError, ConversionError) as e:
         print(f"Error converting conversations: {e}")
         sys.exit(1)
+    finally:
+        flush_log_handlers()
 
     return user_id
 
@@ -103,33 +158,43 @@ def convert_memory_to_sql(provider: str = "chatgpt", user_id: str = "user") -> N
         sys.exit(1)
 
 
-def run_migrations(provider: str = "chatgpt") -> None:
+def run_migrations(provider: str = "chatgpt", context: Optional[MigrationContext] = None) -> None:
     """Run the SQL migrations on the database."""
     print("Running migrations...")
 
-    db_manager = DatabaseManager()
-
-    sql_files = [
-        (Config.CONVERSATIONS_SQL_NAME, "conversations"),
-        (Config.MEMORY_SQL_NAME, "memory"),
-    ]
+    context = context or MigrationContext(provider)
+    db_manager = context.db_manager
+    migration_provider = ProviderFactory.create(provider)
+    user_id = context.user_id or get_user_id_from_database(context)
 
-    for sql_file, migration_type in sql_files:
-        if Path(sql_file).exists():
-            print(f"Applying {migration_type} migration...")
+    with db_manager.bulk_load():
+        print("Applying conversations migration...")
+        try:
+            db_manager.execute_rows(migration_provider.conversation_rows(user_id), [provider])
+        except (DatabaseError, ProviderError) as e:
+            print(f"Error applying conversations migration: {e}")
+            sys.exit(1)
+        finally:
+            # In-memory conversions are converted while their rows are inserted
+            flush_log_handlers()
+
+        if Path(Config.MEMORY_SQL_NAME).exists():
+            print("Applying memory migration...")
             try:
-                db_manager.execute_sql_file(sql_file)
+                db_manager.execute_sql_file(Config.MEMORY_SQL_NAME)
             except (DatabaseError, FileNotFoundError, OSError) as e:
-                print(f"Error applying {migration_type} migration: {e}")
+                print(f"Error applying memory migration: {e}")
                 sys.exit(1)
         else:
-            print(f"No {sql_file} found, skipping {migration_type} migration.")
+            print(f"No {Config.MEMORY_SQL_NAME} found, skipping memory migration.")
+
+    # Release the connection before the file is copied into the container
+    db_manager.close()
 
-    docker_manager = DockerManager()
-    db_sync = DatabaseSync(docker_manager)
+    db_sync = DatabaseSync(context.docker_manager)
     db_sync.push_database()
 
-    copy_ai_generated_images_to_docker(provider)
+    copy_ai_generated_images_to_docker(provider, context)
 
 
 def clear_artifacts() -> None:
@@ -145,14 +210,17 @@ def clear_artifacts() -> None:
                 artifact_path.unlink()
 
 
-def start_open_webui() -> None:
+def start_open_webui(context: Optional[MigrationContext] = None) -> None:
     """Start the open-webui Docker container."""
-    docker_manager = DockerManager()
-    docker_manager.start_container()
+    context = context or MigrationContext()
+    context.docker_manager.start_container()
+
 
+def migrate_provider(provider: str = "chatgpt", validate: bool = True) -> None:
+    """Migrate data for a specific provider.
 
-def migrate_provider(provider: str = "chatgpt") -> None:
-    """Migrate data for a specific provider."""
+    Pass ``validate=False`` when the provider's data files were already checked.
+    """
     print(f"\n{'='*60}")
     print(f"Starting migration for {provider}...")
     print(f"{'='*60}\n")
@@ -164,24 +232,27 @@ def migrate_provider(provider: str = "chatgpt") -> None:
         )
         sys.exit(1)
 
-    migration_provider = ProviderFactory.create(provider)
+    if validate:
+        migration_provider = ProviderFactory.create(provider)
 
-    try:
-        migration_provider.validate_data_files()
-    except FileNotFoundError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+        try:
+            migration_provider.validate_data_files()
+        except (FileNotFoundError, FileOperationError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
 
     try:
-        stop_open_webui()
-        copy_existing_database_from_docker()
-        create_backup_database_from_existing_database()
+        context = MigrationContext(provider)
+
+        stop_open_webui(context)
+        copy_existing_database_from_docker(context)
+        create_backup_database_from_existing_database(context)
 
-        user_id = convert_conversation_to_sql(provider)
+        user_id = convert_conversation_to_sql(provider, context=context)
         convert_memory_to_sql(provider, user_id=user_id)
 
-        run_migrations(provider)
-        start_open_webui()
+        run_migrations(provider, context)
+        start_open_webui(context)
 
         print(f"\n{'='*60}")
         print("MIGRATION SUMMARY")
@@ -210,7 +281,7 @@ def migrate_all() -> None:
     print("Starting migration for all supported providers...")
 
     supported_providers = ProviderFactory.get_supported_providers()
-    migrated_any = False
+    providers_with_data = []
 
     for provider_name in supported_providers:
         provider_path = Config.get_provider_path(provider_name)
@@ -222,17 +293,19 @@ def migrate_all() -> None:
         try:
             migration_provider = ProviderFactory.create(provider_name)
             migration_provider.validate_data_files()
-
-            print(f"Found {provider_name} data, migrating...")
-            migrate_provider(provider_name)
-            migrated_any = True
-
+            providers_with_data.append(provider_name)
         except FileNotFoundError:
             print(f"Found {provider_name} folder but no valid data files, skipping...")
         except (ProviderError, FileOperationError) as e:
             print(f"Error checking {provider_name}: {e}")
 
-    if not migrated_any:
+    # Every provider stops the same container and rewrites the same local
+    # database and SQL files, so migrations cannot overlap
+    for provider_name in providers_with_data:
+        print(f"Found {provider_name} data, migrating...")
+        migrate_provider(provider_name, validate=False)
+
+    if not providers_with_data:
         print("No data found for any supported providers.")
         print("Please add your exported data to the appropriate folders under data/")
         print("Supported providers: " + ", ".join(supported_providers))
@@ -2,14 +2,24 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Any
-import subprocess
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 from utils.config import Config
-from utils.file_ops import SQLFileManager
+from utils.create_sql import ChatRow, conversations_to_rows, file_to_rows, gather_files
+from utils.file_ops import FileManager, SQLFileManager
 from utils.exceptions import ProviderError, UnsupportedProviderError, FileOperationError
-from utils.chatgpt.migrate_chatgpt_conversations import convert_file
+from utils.chatgpt.migrate_chatgpt_conversations import convert_file, iter_file
 from utils.chatgpt import parse_memory_file, create_memory_sql
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Bytes read from the start of an export to check its top-level shape
+EXPORT_PROBE_SIZE = 64 * 1024
+# Exports above this size should be streamed rather than loaded whole
+LARGE_EXPORT_SIZE = 100 * 1024 * 1024
+
 
 class MigrationProvider(ABC):
     """Abstract base class for migration providers."""
@@ -28,6 +38,10 @@ class MigrationProvider(ABC):
     def convert_conversations(self, user_id: str) -> None:
         """Convert conversations to OpenWebUI format."""
 
+    @abstractmethod
+    def conversation_rows(self, user_id: str) -> Iterator[ChatRow]:
+        """Yield the chat rows of the converted conversations."""
+
     @abstractmethod
     def convert_memory(self, user_id: str) -> None:
         """Convert memory/custom instructions to SQL format."""
@@ -48,9 +62,17 @@ class MigrationProvider(ABC):
 class ChatGPTProvider(MigrationProvider):
     """Migration provider for ChatGPT exports."""
 
-    def __init__(self):
-        """Initialize the ChatGPT provider."""
+    def __init__(self, persist: Optional[bool] = None):
+        """Initialize the ChatGPT provider.
+
+        Args:
+            persist: Write one JSON file per converted conversation and read the
+                chat rows back from those files. By default conversations are
+                converted in memory as their rows are inserted, unless the
+                PERSIST_CONVERSATIONS environment variable is set.
+        """
         super().__init__("chatgpt")
+        self.persist = Config.get_env_persist_conversations() if persist is None else persist
 
     def get_required_files(self) -> List[str]:
         """Get required files for ChatGPT migration."""
@@ -73,11 +95,31 @@ class ChatGPTProvider(MigrationProvider):
 
         if conversations_file.exists():
             print(f"Found conversations file: {conversations_file}")
+            self._probe_conversations_file(conversations_file)
         if memory_file.exists():
             print(f"Found memory file: {memory_file}")
 
         return True
 
+    @staticmethod
+    def _probe_conversations_file(conversations_file: Path) -> None:
+        """Check the top-level shape of an export from its first bytes only."""
+        with open(conversations_file, "rb") as f:
+            head = f.read(EXPORT_PROBE_SIZE).lstrip()
+
+        if not head.startswith((b"[", b"{")):
+            raise FileOperationError(
+                f"{conversations_file} does not look like a ChatGPT export: "
+                "expected a JSON array or object"
+            )
+
+        size = conversations_file.stat().st_size
+        if size > LARGE_EXPORT_SIZE and ijson is None:
+            print(
+                f"Warning: {conversations_file} is {size // (1024 * 1024)} MB and will be "
+                "loaded into memory whole; install ijson to stream it instead"
+            )
+
     def convert_conversations(self, user_id: str) -> None:
         """Convert ChatGPT conversations to OpenWebUI format."""
         conversations_path = self.data_path / "conversations.json"
@@ -86,15 +128,59 @@ class ChatGPTProvider(MigrationProvider):
             print("No conversations.json found. Skipping conversation conversion.")
             return
 
-        print(f"Converting ChatGPT conversations for user: {user_id}")
-
         try:
+            # Start from an empty directory, so files from an earlier export or
+            # the other mode are never read back
+            FileManager.remove_path(self.output_path)
             self.output_path.mkdir(parents=True, exist_ok=True)
+            if not self.persist:
+                # Converted one at a time while the rows are inserted
+                return
+
+            print(f"Converting ChatGPT conversations for user: {user_id}")
             convert_file(str(conversations_path), user_id=user_id, outdir=str(self.output_path))
             print(f"Successfully converted conversations to {self.output_path}")
         except Exception as e:
             raise ProviderError(f"Failed to convert conversations: {e}") from e
 
+    def conversation_rows(self, user_id: str) -> Iterator[ChatRow]:
+        """Yield the chat rows of the ChatGPT conversations.
+
+        Persisted conversions are read back from the output directory; otherwise
+        the export is converted here, one conversation at a time.
+        """
+        conversations_path = self.data_path / "conversations.json"
+
+        try:
+            if self.persist:
+                if self.output_path.exists():
+                    for path in gather_files([str(self.output_path)]):
+                        yield from file_to_rows(path, [self.name])
+            elif conversations_path.exists():
+                print(f"Converting ChatGPT conversations for user: {user_id}")
+                yield from conversations_to_rows(
+                    self._record_referenced_files(iter_file(str(conversations_path), user_id)),
+                    [self.name],
+                )
+        except Exception as e:
+            raise ProviderError(f"Failed to convert conversations: {e}") from e
+
+    def _record_referenced_files(
+        self, conversations: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Pass conversations through, saving the files each one references by path.
+
+        Only ``{"files": [...]}`` is written, which is all the image copy step
+        reads from a converted conversation. The files go in their own
+        subdirectory so they are never mistaken for converted conversations.
+        """
+        files_path = self.output_path / Config.REFERENCED_FILES_DIR
+        for conv in conversations:
+            files = [file_data for file_data in conv.get("files", ()) if "source_path" in file_data]
+            if files:
+                FileManager.save_json({"files": files}, files_path / f"{conv['id']}.json")
+            yield conv
+
     def convert_memory(self, user_id: str) -> None:
         """Convert ChatGPT memory to SQL format."""
         memory_path = self.data_path / "memory.txt"
@@ -117,23 +203,6 @@ class ChatGPTProvider(MigrationProvider):
         except Exception as e:
             raise ProviderError(f"Failed to convert memory: {e}") from e
 
-    def generate_sql_from_json(self) -> None:
-        """Generate SQL from converted JSON files."""
-        if not self.output_path.exists():
-            return
-
-        cmd = [
-            "python",
-            "utils/create_sql.py",
-            str(self.output_path),
-            f"--tags={self.name}",
-            f"--output={Config.CONVERSATIONS_SQL_NAME}",
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode != 0:
-            raise ProviderError(f"Failed to create SQL: {result.stderr}")
-
 
 class ProviderFactory:
     """Factory class for creating migration providers."""